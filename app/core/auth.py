@@ -1,11 +1,15 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.crud import get_database
-from app.core.security import verify_password
+from app.core.logging import logger
+from app.core.metrics import track
+from app.core.security import verify_password_async
+from app.core.tokens import TokenError, TokenVerifier, get_jwt_backend
 from app.core.models.user import UserInDB
 from os import getenv
 from dotenv import load_dotenv
@@ -25,46 +29,67 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # OAuth2 scheme - Update the tokenUrl to include the /auth prefix
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# Authenticated users keyed on the token subject, so repeated requests with
+# the same token skip the users lookup until the entry expires
+user_cache = TTLCache(
+    maxsize=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl_seconds,
+)
+
+# Verified token claims keyed on the token digest, each kept until the
+# token expires at the latest
+token_verifier = TokenVerifier(
+    backend=get_jwt_backend(settings.jwt_backend),
+    key=SECRET_KEY,
+    algorithm=ALGORITHM,
+    cache=TTLCache(
+        maxsize=settings.token_cache_max_size,
+        ttl=settings.token_cache_ttl_seconds,
+    ),
+)
+
 async def authenticate_user(db: AsyncIOMotorDatabase, username: str, password: str):
     user_dict = await db.users.find_one({"username": username})
     if not user_dict:
         return False
     user = UserInDB(**user_dict)
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    expires_delta = expires_delta or timedelta(minutes=15)
+    return token_verifier.encode(data, expires_in=expires_delta.total_seconds())
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> UserInDB:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    with track("auth"):
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            payload = token_verifier.verify(token)
+            username: str = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+        except TokenError as e:
+            # Add logging to see what's going wrong
+            logger.warning("JWT Error: %s", e)
             raise credentials_exception
-    except JWTError as e:
-        # Add logging to see what's going wrong
-        print(f"JWT Error: {str(e)}")
-        raise credentials_exception
     
-    user_dict = await db.users.find_one({"username": username})
-    if user_dict is None:
-        raise credentials_exception
-        
-    return UserInDB(**user_dict) 
\ No newline at end of file
+        user = user_cache.get(username)
+        if user is not None:
+            return user
+
+        user_dict = await db.users.find_one({"username": username})
+        if user_dict is None:
+            raise credentials_exception
+
+        user = UserInDB(**user_dict)
+        user_cache.set(username, user)
+        return user
+ 
\ No newline at end of file
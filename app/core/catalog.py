@@ -0,0 +1,226 @@
+"""List and detail handlers shared by the catalog routes (brand, merchant).
+
+Each route module declares a ``CatalogResource`` and delegates to
+``list_catalog`` and ``get_catalog_item``, which own the export, response
+cache, pagination and count logic for every catalog collection.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Type
+
+from fastapi import HTTPException, Query, Request, Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.crud import MongoManager, parse_fields
+from app.core.enums import ExportFormat, SearchMode
+from app.core.exceptions import DatabaseException, ResourceNotFoundException
+from app.core.export import export_response, get_exporter
+from app.core.logging import logger
+from app.core.models.catalog import Record
+from app.core.response_cache import conditional_response, response_cache
+from app.core.responses import render_model
+
+
+@dataclass(frozen=True)
+class CatalogResource:
+    collection: str
+    record_type: Type[Record]
+    response_model: Type[BaseModel]
+    # Singular name for errors ("Brand"), plural for logs and filenames ("brands")
+    title: str
+    plural: str
+
+    def crud(self) -> MongoManager:
+        return MongoManager(self.collection, self.record_type)
+
+
+@dataclass(frozen=True)
+class CatalogListParams:
+    name: Optional[str]
+    search: SearchMode
+    export_as: Optional[ExportFormat]
+    page: int
+    page_size: int
+    cursor: Optional[str]
+    fields: Optional[str]
+    include_total: bool
+    exact_total: bool
+
+async def catalog_list_params(
+    name: str = None,
+    search: SearchMode = Query(
+        SearchMode.REGEX,
+        description="Name filter strategy: regex (substring), prefix (indexed prefix) or text (text index)"
+    ),
+    export_as: Optional[ExportFormat] = Query(
+        ExportFormat.JSON,
+        description="Export format: json, csv, ndjson, excel or parquet"
+    ),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous response's next_cursor; seeks past it instead of skipping pages"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated fields to return, e.g. name,manufacturer"
+    ),
+    include_total: bool = Query(True, description="Include the total count in the pagination metadata"),
+    exact_total: bool = Query(False, description="Count exactly instead of using estimated or cached totals"),
+) -> CatalogListParams:
+    """Query parameters of the catalog list endpoints.
+
+    Async on purpose: FastAPI runs sync dependencies, class constructors
+    included, on the threadpool.
+    """
+    return CatalogListParams(
+        name=name,
+        search=search,
+        export_as=export_as,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields,
+        include_total=include_total,
+        exact_total=exact_total,
+    )
+
+
+async def list_catalog(
+    request: Request,
+    resource: CatalogResource,
+    params: CatalogListParams,
+    db: AsyncIOMotorDatabase,
+) -> Response:
+    plural = resource.plural
+    try:
+        logger.info(
+            "Fetching %s - Page: %s, Size: %s, Filter: %s, Format: %s",
+            plural, params.page, params.page_size, params.name, params.export_as
+        )
+
+        # Calculate skip based on page and page_size
+        skip: int = (params.page - 1) * params.page_size
+        limit: int = params.page_size
+
+        search_strategy = params.search.value if params.name else None
+        if search_strategy:
+            logger.info("Filtering %s with %s search", plural, search_strategy)
+
+        requested_fields = parse_fields(params.fields)
+
+        crud = resource.crud()
+
+        # Exports stream every matching document and skip the pagination queries
+        if params.export_as != ExportFormat.JSON:
+            logger.info("Preparing %s export", params.export_as.value)
+
+            # Add export filename with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename_base = f"{plural}_{timestamp}"
+
+            documents = crud.iter_all(
+                db,
+                params.name,
+                limit=settings.export_max_rows,
+                search=params.search,
+                batch_size=settings.export_batch_size,
+                fields=requested_fields
+            )
+            # Columns are the requested fields, or the declared fields followed
+            # by any extra fields the exported documents carry
+            fieldnames = requested_fields or [
+                *resource.record_type.field_names(),
+                *await crud.extra_field_names(
+                    db, params.name, limit=settings.export_max_rows, search=params.search
+                ),
+            ]
+            exporter = get_exporter(
+                params.export_as,
+                fieldnames,
+                batch_size=settings.export_batch_size,
+                field_types=resource.record_type.field_types()
+            )
+            return export_response(exporter, documents, filename_base)
+
+        # Serve repeated page requests from the response cache
+        cache_key = response_cache.make_key(
+            resource.collection,
+            name=params.name,
+            search=params.search.value,
+            page=params.page,
+            page_size=params.page_size,
+            cursor=params.cursor,
+            fields=requested_fields,
+            include_total=params.include_total
+        )
+        cached = None if params.exact_total else await response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached JSON response for %s", plural)
+            return conditional_response(request, *cached)
+
+        # Get paginated data, counting concurrently when a total is requested
+        page_query = crud.get_page(
+            db,
+            params.name,
+            limit=limit,
+            skip=skip,
+            after=params.cursor,
+            search=params.search,
+            fields=requested_fields
+        )
+        if params.include_total:
+            total_count, (documents, next_cursor) = await asyncio.gather(
+                crud.count(db, params.name, exact=params.exact_total, search=params.search),
+                page_query
+            )
+            logger.info("Total %s count: %s", plural, total_count)
+        else:
+            total_count = None
+            documents, next_cursor = await page_query
+
+        # Add pagination metadata
+        page_size = params.page_size
+        pagination = {
+            "total": total_count,
+            "page": params.page,
+            "page_size": page_size,
+            "pages": (total_count + page_size - 1) // page_size if total_count is not None else None
+        }
+
+        logger.info("Returning JSON response with %s %s", len(documents), plural)
+        body = render_model(
+            resource.response_model,
+            data=documents,
+            pagination=pagination,
+            next_cursor=next_cursor,
+            search_strategy=search_strategy
+        )
+        etag = await response_cache.set(cache_key, body)
+        return conditional_response(request, body, etag)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error fetching %s: %s", plural, e, exc_info=True)
+        raise DatabaseException(detail=f"Failed to fetch {plural}: {str(e)}")
+
+async def get_catalog_item(resource: CatalogResource, item_id: str, db: AsyncIOMotorDatabase) -> Response:
+    try:
+        record = await resource.crud().get_by_id(item_id, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error fetching %s %s: %s", resource.collection, item_id, e, exc_info=True)
+        raise DatabaseException(detail=f"Failed to fetch {resource.collection}: {str(e)}")
+
+    if record is None:
+        raise ResourceNotFoundException(resource.title)
+    return Response(
+        content=render_model(resource.response_model, data=record.to_dict()),
+        media_type="application/json"
+    )
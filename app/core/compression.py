@@ -0,0 +1,299 @@
+"""Negotiated response compression.
+
+``CompressionMiddleware`` picks the best encoding the client accepts out of
+``settings.compression_encodings`` (gzip is always available; ``br`` and
+``zstd`` need the optional ``brotli`` and ``zstandard`` packages) and
+compresses compressible media types:
+
+* complete bodies under ``compression_min_size`` are sent as is, and
+  bodies over ``compression_offload_size`` are compressed on a worker thread
+  so large pages do not stall the event loop;
+* streamed bodies (exports) are compressed chunk by chunk, flushing after
+  each one so clients still receive data progressively.
+
+Compression ratio and CPU time are accumulated per route in
+``compression_stats``.
+"""
+import asyncio
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import record_phase, route_path
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class GzipEncoder:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    encoding = "br"
+
+    def __init__(self, level: int):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    encoding = "zstd"
+
+    def __init__(self, level: int):
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _available_encoders() -> Dict[str, Tuple[Callable[[int], Any], int]]:
+    encoders = {"gzip": (GzipEncoder, settings.compression_gzip_level)}
+    try:
+        import brotli  # noqa: F401
+        encoders["br"] = (BrotliEncoder, settings.compression_brotli_quality)
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401
+        encoders["zstd"] = (ZstdEncoder, settings.compression_zstd_level)
+    except ImportError:
+        pass
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def negotiate_encoding(header: Optional[str], supported: List[str]) -> Optional[str]:
+    """Pick the encoding with the highest q-value; ties follow ``supported`` order."""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+class CompressionStats:
+    """Bytes in/out and CPU seconds spent compressing, per route and encoding."""
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(
+        self,
+        route: str,
+        encoding: str,
+        raw: int,
+        compressed: int,
+        cpu_seconds: float,
+        new_response: bool = False,
+    ) -> None:
+        entry = self._routes.setdefault(
+            (route, encoding),
+            {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0},
+        )
+        entry["responses"] += new_response
+        entry["bytes_in"] += raw
+        entry["bytes_out"] += compressed
+        entry["cpu_seconds"] += cpu_seconds
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "route": route,
+                "encoding": encoding,
+                **entry,
+                "ratio": entry["bytes_in"] / entry["bytes_out"] if entry["bytes_out"] else None,
+            }
+            for (route, encoding), entry in sorted(self._routes.items())
+        ]
+
+    def clear(self) -> None:
+        self._routes.clear()
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        min_size: Optional[int] = None,
+        offload_size: Optional[int] = None,
+        encodings: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.min_size = settings.compression_min_size if min_size is None else min_size
+        self.offload_size = settings.compression_offload_size if offload_size is None else offload_size
+        available = _available_encoders()
+        preferred = encodings or [
+            encoding.strip() for encoding in settings.compression_encodings.split(",")
+        ]
+        self.encoders = {encoding: available[encoding] for encoding in preferred if encoding in available}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), list(self.encoders)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+        self.first_chunk = True
+
+    def _new_encoder(self):
+        factory, level = self.middleware.encoders[self.encoding]
+        return factory(level)
+
+    async def _compress(self, data: bytes, finish: bool = False) -> bytes:
+        def run() -> Tuple[bytes, float]:
+            started = time.thread_time()
+            output = self.encoder.compress(data) if data else b""
+            if finish:
+                output += self.encoder.finish()
+            return output, time.thread_time() - started
+
+        if len(data) >= self.middleware.offload_size:
+            output, cpu_seconds = await asyncio.to_thread(run)
+        else:
+            output, cpu_seconds = run()
+        record_phase("compression", cpu_seconds)
+        compression_stats.record(
+            route_path(self.scope),
+            self.encoding,
+            len(data),
+            len(output),
+            cpu_seconds,
+            new_response=self.first_chunk,
+        )
+        self.first_chunk = False
+        return output
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk tells us the size
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = Headers(raw=self.start_message["headers"])
+            if (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+                or self.start_message["status"] in (204, 304)
+                or (not more_body and len(body) < self.middleware.min_size)
+            ):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.encoder = self._new_encoder()
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # A strong validator names one exact representation, and the
+            # encoded bytes are a different one
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = await self._compress(body, finish=True)
+                headers["Content-Length"] = str(len(body))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(self.start_message)
+
+        body = await self._compress(body, finish=not more_body)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -1,15 +1,107 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
+
+ReadPreferenceMode = Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"]
 
 class Settings(BaseSettings):
     # MongoDB settings
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "filler_wiki"
+    ensure_indexes_on_startup: bool = True
+
+    # MongoDB connection pool settings
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: Optional[int] = None
+    mongo_wait_queue_timeout_ms: Optional[int] = None
+    mongo_server_selection_timeout_ms: int = 30000
+    mongo_connect_timeout_ms: int = 20000
+    # Comma separated wire compressors in preference order, e.g. "zstd,snappy,zlib".
+    # zstd and snappy need the zstandard and python-snappy packages.
+    mongo_compressors: str = ""
+
+    # Read routing for read-only routers. Catalog covers /brand and /merchant,
+    # tickets covers GET /tickets. Max staleness is in seconds (-1 for no
+    # bound, otherwise at least 90); read concern is e.g. "local" or "majority".
+    catalog_read_preference: ReadPreferenceMode = "primary"
+    catalog_max_staleness_seconds: int = -1
+    catalog_read_concern: Optional[str] = None
+    tickets_read_preference: ReadPreferenceMode = "primary"
+    tickets_max_staleness_seconds: int = -1
+    tickets_read_concern: Optional[str] = None
     
     # JWT settings
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Refresh tokens rotate on every use; sessions end after this many days
+    refresh_token_expire_days: int = 30
+    # "pyjwt" needs the optional PyJWT package
+    jwt_backend: Literal["jose", "pyjwt"] = "jose"
+
+    # Verified token cache settings; entries never outlive the token's exp
+    # (0 disables the cache)
+    token_cache_ttl_seconds: float = 300
+    token_cache_max_size: int = 4096
+
+    # Authenticated user cache settings (0 disables the cache)
+    user_cache_ttl_seconds: float = 60
+    user_cache_max_size: int = 1024
+
+    # last_login updates are buffered and written in bulk by a background
+    # task, every interval or once max_pending users are waiting
+    last_login_flush_interval_seconds: float = 5
+    last_login_max_pending: int = 1000
+
+    # Password hashing pool settings
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+
+    # Filtered list count cache settings (0 disables the cache)
+    count_cache_ttl_seconds: float = 30
+    count_cache_max_size: int = 256
+
+    # Export settings
+    export_max_rows: int = 10000
+    export_batch_size: int = 500
+
+    # Catalog response cache settings (0 disables the in-process tier).
+    # The Redis tier needs the optional redis package and has its own TTL
+    # (0 disables it); change streams need a replica set.
+    response_cache_ttl_seconds: float = 60
+    response_cache_max_size: int = 512
+    response_cache_redis_url: Optional[str] = None
+    response_cache_shared_ttl_seconds: float = 60
+    response_cache_change_streams: bool = False
+
+    # Serialize list responses in one pass with orjson instead of Pydantic
+    fast_json_responses: bool = True
+
+    # Response compression. Encodings are listed in order of preference; br
+    # and zstd need the optional brotli and zstandard packages. Bodies from
+    # compression_offload_size bytes up are compressed on a worker thread.
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"
+    compression_min_size: int = 1024
+    compression_offload_size: int = 256 * 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # Logging goes through a bounded queue to a background thread; records
+    # are dropped when it is full. The sample rate is the fraction of
+    # INFO/DEBUG records kept per call site (1 keeps everything).
+    log_queue_size: int = 10000
+    log_sample_rate: float = 1.0
+
+    # Request timing and the Prometheus /metrics endpoint. Off by default as
+    # the service is publicly reachable; when metrics_token is set, scrapes
+    # must send it as a bearer token.
+    metrics_enabled: bool = False
+    metrics_token: Optional[str] = None
+
+    # Tickets settings
+    ticket_bulk_chunk_size: int = 500
 
     class Config:
         env_file = ".env"
@@ -1,64 +1,268 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Iterable, Optional, Tuple, Type
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import Depends
+from bson import ObjectId
+from bson.errors import InvalidId
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.enums import SearchMode
+from app.core.exceptions import ValidationException
+from app.core.models.catalog import Record
+from app.core.response_cache import response_cache
 from datetime import datetime
+import base64
+import re
+
+# Fields matched by the name filter. Each one has a lowercase twin
+# (e.g. ``name_lower``) that backs the indexed prefix search.
+SEARCH_FIELDS = ("name", "manufacturer")
+NORMALIZED_SUFFIX = "_lower"
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """Encode the last seen _id as an opaque, URL-safe pagination cursor."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded).decode())
+    except (ValueError, InvalidId):
+        raise ValidationException(detail="Invalid pagination cursor")
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma separated ``fields`` query parameter, keeping order."""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+def normalize_search_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Populate the lowercase search fields of a document in place."""
+    for field in SEARCH_FIELDS:
+        value = document.get(field)
+        if isinstance(value, str):
+            document[f"{field}{NORMALIZED_SUFFIX}"] = value.lower()
+    return document
+
+# Filtered totals keyed on (collection, filter); unfiltered totals come from
+# collection metadata and are cheap enough not to need caching
+count_cache = TTLCache(
+    maxsize=settings.count_cache_max_size,
+    ttl=settings.count_cache_ttl_seconds,
+)
+
 
 class MongoManager:
-    def __init__(self, collection_name: str):
+    def __init__(self, collection_name: str, model: Optional[Type[Record]] = None):
         self.collection_name = collection_name
+        # Optional slotted record type; its fields bound what can be projected
+        self.model = model
 
-    async def get_all(self, db: AsyncIOMotorDatabase, name: str = None, limit: int = 0, skip: int = 0) -> List[Dict[Any, Any]]:
-        collection = db[self.collection_name]
-        
-        # Set projection to exclude _id field
-        projection = {"_id": 0}
-        
-        if name:
-            # Case-insensitive search for either name or manufacturer field
-            query = {
+    def _build_query(self, name: str = None, search: SearchMode = SearchMode.REGEX) -> Dict[str, Any]:
+        if not name:
+            return {}
+
+        if search == SearchMode.TEXT:
+            # Served by the text index on name and manufacturer
+            return {"$text": {"$search": name}}
+
+        if search == SearchMode.PREFIX:
+            # Anchored, case-sensitive prefix on the lowercase fields can use
+            # their regular indexes
+            prefix = "^" + re.escape(name.strip().lower())
+            return {
                 "$or": [
-                    {"name": {"$regex": name, "$options": "i"}},
-                    {"manufacturer": {"$regex": name, "$options": "i"}}
+                    {f"{field}{NORMALIZED_SUFFIX}": {"$regex": prefix}}
+                    for field in SEARCH_FIELDS
                 ]
             }
-            cursor = collection.find(query, projection)
+
+        # Case-insensitive substring search for either name or manufacturer field
+        pattern = re.escape(name)
+        return {
+            "$or": [
+                {field: {"$regex": pattern, "$options": "i"}}
+                for field in SEARCH_FIELDS
+            ]
+        }
+
+    def _projection(self, include_id: bool = False, fields: Optional[List[str]] = None) -> Dict[str, int]:
+        if fields:
+            # Sparse fieldset: fetch only the requested (allow-listed) fields
+            projection = self._field_projection(fields)
         else:
-            cursor = collection.find({}, projection)
-        
-        # Apply pagination
-        if skip > 0:
-            cursor = cursor.skip(skip)
+            # Hide the internal lowercase search fields from API consumers
+            projection = {f"{field}{NORMALIZED_SUFFIX}": 0 for field in SEARCH_FIELDS}
+        if not include_id:
+            projection["_id"] = 0
+        return projection
+
+    def _field_projection(self, fields: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Inclusion projection on the model fields, or on a subset of them."""
+        if self.model is None:
+            raise ValidationException(detail=f"Field selection is not supported for {self.collection_name}")
+        allowed = self.model.field_names()
+        requested = list(fields) if fields else list(allowed)
+        unknown = [field for field in requested if field not in allowed]
+        if unknown:
+            raise ValidationException(
+                detail=f"Unknown fields for {self.collection_name}: {', '.join(unknown)}"
+            )
+        return {field: 1 for field in requested}
+
+    def iter_all(
+        self,
+        db: AsyncIOMotorDatabase,
+        name: str = None,
+        limit: int = 0,
+        search: SearchMode = SearchMode.REGEX,
+        batch_size: int = 500,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[Any, Any]]:
+        """Iterate over matching documents as the cursor fetches them, batch by batch.
+
+        The query and projection are built when this is called rather than on
+        first iteration, so unknown ``fields`` raise before a streaming
+        response has started.
+        """
+        collection = db[self.collection_name]
+
+        cursor = collection.find(self._build_query(name, search), self._projection(fields=fields))
+        cursor = cursor.batch_size(batch_size)
         if limit > 0:
             cursor = cursor.limit(limit)
-        
+
+        async def documents():
+            async for document in cursor:
+                yield document
+
+        return documents()
+
+    async def extra_field_names(
+        self,
+        db: AsyncIOMotorDatabase,
+        name: str = None,
+        limit: int = 0,
+        search: SearchMode = SearchMode.REGEX,
+    ) -> List[str]:
+        """Names of the undeclared fields carried by the matching documents.
+
+        Lets exports add columns for extra fields up front, since a streamed
+        file cannot grow columns once its header is out. Documents are grouped
+        server side by their list of keys, so only one list per distinct
+        document shape is transferred.
+        """
+        pipeline: List[Dict[str, Any]] = [{"$match": self._build_query(name, search)}]
+        if limit > 0:
+            pipeline.append({"$limit": limit})
+        pipeline.append(
+            {"$group": {"_id": {"$map": {"input": {"$objectToArray": "$$ROOT"}, "in": "$$this.k"}}}}
+        )
+        names = {key async for shape in db[self.collection_name].aggregate(pipeline) for key in shape["_id"]}
+
+        hidden = {"_id", *(f"{field}{NORMALIZED_SUFFIX}" for field in SEARCH_FIELDS)}
+        declared = set(self.model.field_names()) if self.model else set()
+        return sorted(name for name in names if name not in hidden and name not in declared)
+
+    async def get_page(
+        self,
+        db: AsyncIOMotorDatabase,
+        name: str = None,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[str] = None,
+        search: SearchMode = SearchMode.REGEX,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[Any, Any]], Optional[str]]:
+        """Fetch one page ordered by ``_id`` and the cursor for the next one.
+
+        With ``after`` the query seeks past the cursor on the ``_id`` index,
+        so deep pages cost the same as the first one. Without it, ``skip`` is
+        applied as before for page/page_size clients.
+        """
+        collection = db[self.collection_name]
+
+        query = self._build_query(name, search)
+        if after:
+            seek = {"_id": {"$gt": decode_cursor(after)}}
+            query = {"$and": [query, seek]} if query else seek
+
+        cursor = collection.find(query, self._projection(include_id=True, fields=fields)).sort("_id", 1)
+        if skip > 0 and not after:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(limit)
+
         documents = await cursor.to_list(length=None)
-        return documents
 
-    async def get_by_id(self, id: str, db: AsyncIOMotorDatabase):
-        # Add more methods as needed
-        pass 
+        next_cursor = None
+        if documents and len(documents) == limit:
+            next_cursor = encode_cursor(documents[-1]["_id"])
+        for document in documents:
+            document.pop("_id", None)
 
-    async def count(self, db: AsyncIOMotorDatabase, name: str = None) -> int:
+        return documents, next_cursor
+
+    async def get_by_id(self, id: str, db: AsyncIOMotorDatabase, fields: Optional[List[str]] = None):
+        """Fetch one document by its ObjectId, or None when it does not exist.
+
+        With ``fields``, only those (allow-listed) fields are fetched. With a
+        model the result is a record instead of a dict.
+        """
+        try:
+            object_id = ObjectId(id)
+        except (InvalidId, TypeError):
+            return None
+
+        projection = self._projection(include_id=True, fields=fields)
+
+        document = await db[self.collection_name].find_one({"_id": object_id}, projection)
+        if document is None:
+            return None
+        return self.model.from_document(document) if self.model else document
+
+    async def count(
+        self,
+        db: AsyncIOMotorDatabase,
+        name: str = None,
+        exact: bool = False,
+        search: SearchMode = SearchMode.REGEX,
+    ) -> int:
+        """Count documents matching the name filter.
+
+        Unless ``exact`` is set, unfiltered totals use the collection metadata
+        (``estimatedDocumentCount``) and filtered totals are served from a
+        short-lived cache.
+        """
         collection = db[self.collection_name]
-        if name:
-            # Case-insensitive search for either name or manufacturer field
-            query = {
-                "$or": [
-                    {"name": {"$regex": name, "$options": "i"}},
-                    {"manufacturer": {"$regex": name, "$options": "i"}}
-                ]
-            }
+        query = self._build_query(name, search)
+        if exact:
             return await collection.count_documents(query)
-        else:
-            return await collection.count_documents({}) 
+        if not name:
+            return await collection.estimated_document_count()
+
+        key = (self.collection_name, search.value, name)
+        total = count_cache.get(key)
+        if total is None:
+            total = await collection.count_documents(query)
+            count_cache.set(key, total)
+        return total
 
     async def create(self, db, data: Dict[Any, Any]) -> Dict[Any, Any]:
         # Add created_at field automatically
-        data["created_at"] = {"$currentDate": {"$type": "date"}}
+        data["created_at"] = datetime.utcnow().replace(microsecond=0)
+        normalize_search_fields(data)
         
         collection = db[self.collection_name]
         result = await collection.insert_one(data)
         
-        # Fetch and return the created document
-        return await collection.find_one({"_id": result.inserted_id}) 
\ No newline at end of file
+        # Drop cached pages and totals that no longer include this document
+        await response_cache.invalidate(self.collection_name)
+        count_cache.invalidate_matching(lambda key: key[0] == self.collection_name)
+        
+        # The inserted document is exactly what was sent, so return it
+        # instead of reading it back
+        data["_id"] = result.inserted_id
+        return data 
\ No newline at end of file
@@ -1,16 +1,116 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from fastapi import Depends
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
 from app.core.config import settings
+from app.core.metrics import mongo_command_listener
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# Read-only routers with their own read preference and read concern settings
+READ_PROFILES = ("catalog", "tickets")
+
+
+class Database:
+    """Holds the Motor client, which is created on startup, not at import time."""
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        # Handles on the same database with per-profile read routing
+        self.read_databases: Dict[str, AsyncIOMotorDatabase] = {}
 
 # Database connection
-db = AsyncIOMotorClient()
+db = Database()
+
+def get_client_options() -> Dict[str, Any]:
+    """Build the Motor client options from the pool settings."""
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+    }
+    if settings.mongo_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
+
+def create_client(url: Optional[str] = None) -> AsyncIOMotorClient:
+    # Command monitoring costs a callback per command, so it only runs when
+    # the metrics are exported
+    return AsyncIOMotorClient(
+        url or settings.mongodb_url,
+        event_listeners=[mongo_command_listener] if settings.metrics_enabled else [],
+        **get_client_options(),
+    )
+
+def build_read_preference(mode: str, max_staleness: int = -1):
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCES[mode](max_staleness=max_staleness)
 
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.client = create_client()
     db.database = db.client[settings.database_name]
+    db.read_databases = {}
+    for profile in READ_PROFILES:
+        read_concern = getattr(settings, f"{profile}_read_concern")
+        db.read_databases[profile] = db.client.get_database(
+            settings.database_name,
+            read_preference=build_read_preference(
+                getattr(settings, f"{profile}_read_preference"),
+                getattr(settings, f"{profile}_max_staleness_seconds"),
+            ),
+            read_concern=ReadConcern(read_concern) if read_concern else None,
+        )
+
+async def warm_up_pool() -> int:
+    """Open pool connections up front so the first requests skip the handshakes.
+
+    Concurrent pings each check out their own connection, which leaves
+    ``mongo_min_pool_size`` connections idle in the pool.
+    """
+    connections = settings.mongo_min_pool_size
+    if connections > 0:
+        await asyncio.gather(*(db.database.command("ping") for _ in range(connections)))
+    return connections
 
 async def close_mongo_connection():
-    db.client.close()
+    if db.client is not None:
+        db.client.close()
 
 async def get_database() -> AsyncIOMotorDatabase:
-    return db.database 
\ No newline at end of file
+    return db.database
+
+def get_read_database(profile: str) -> Callable[[], Any]:
+    """Dependency factory returning the database handle for a read profile.
+
+    Writes should keep using ``get_database``, which always targets the primary.
+    """
+    if profile not in READ_PROFILES:
+        raise ValueError(f"Unknown read profile: {profile}")
+
+    async def _get_read_database() -> AsyncIOMotorDatabase:
+        return db.read_databases.get(profile, db.database)
+
+    return _get_read_database
+
+get_catalog_database = get_read_database("catalog")
+get_tickets_read_database = get_read_database("tickets")
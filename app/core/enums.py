@@ -2,4 +2,12 @@ from enum import Enum
 
 class ExportFormat(str, Enum):
     JSON = "json"
-    CSV = "csv"
\ No newline at end of file
+    CSV = "csv"
+    NDJSON = "ndjson"
+    EXCEL = "excel"
+    PARQUET = "parquet"
+
+class SearchMode(str, Enum):
+    REGEX = "regex"
+    PREFIX = "prefix"
+    TEXT = "text"
@@ -52,4 +52,17 @@ class ValidationException(BaseAPIException):
         self, 
         detail: str = "Validation error"
     ):
-        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail) 
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+class ServiceUnavailableException(BaseAPIException):
+    """Exception for when a service is temporarily overloaded"""
+    def __init__(
+        self, 
+        detail: str = "Service temporarily unavailable", 
+        retry_after: int = 1
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
+            detail=detail, 
+            headers={"Retry-After": str(retry_after)}
+        )
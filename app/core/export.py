@@ -0,0 +1,251 @@
+"""Streaming export helpers.
+
+Each export format is an ``Exporter`` registered in ``EXPORTERS``. Exporters
+consume an async iterator of documents (typically ``MongoManager.iter_all``)
+and yield encoded chunks, so list routes can hand any format to
+``export_response`` without a branch per format. Tabular formats take their
+columns from the declared ``fieldnames`` rather than from the documents, as
+a streamed file cannot grow columns once the header is out. Heavy optional
+libraries (openpyxl, pyarrow) are imported only when their exporter runs.
+"""
+import asyncio
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Type
+
+from fastapi.responses import StreamingResponse
+
+from app.core.enums import ExportFormat
+from app.core.responses import dumps
+
+
+async def _batches(
+    documents: AsyncIterator[Dict[str, Any]],
+    batch_size: int,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    async for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _scalar(value: Any) -> Any:
+    """Flatten values that tabular formats cannot store natively."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return str(value)
+
+def _text(value: Any) -> Optional[str]:
+    """Render a value for a string column."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(_scalar(value))
+
+
+async def stream_csv(
+    documents: AsyncIterator[Dict[str, Any]],
+    fieldnames: Sequence[str],
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """Encode documents as CSV, yielding one chunk per batch of rows.
+
+    The header is ``fieldnames``; missing fields are left empty and fields
+    that are not listed are ignored.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    header_written = False
+
+    async for batch in _batches(documents, batch_size):
+        if not header_written:
+            writer.writeheader()
+            header_written = True
+        writer.writerows(batch)
+
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        yield chunk.encode("utf-8")
+
+
+class Exporter:
+    """Base class for export formats.
+
+    ``memory_profile`` documents how much of the export is held at once:
+    ``streaming`` keeps a single batch, ``row_group`` a single batch plus the
+    encoder state, and ``spooled`` writes rows to a temporary file before
+    sending it.
+    """
+
+    format: ExportFormat
+    media_type: str
+    extension: str
+    memory_profile: str = "streaming"
+
+    def __init__(
+        self,
+        fieldnames: Sequence[str],
+        batch_size: int = 500,
+        field_types: Optional[Dict[str, type]] = None,
+    ):
+        self.fieldnames = list(fieldnames)
+        self.batch_size = batch_size
+        # Declared Python type per field, for formats with a typed schema
+        self.field_types = field_types or {}
+
+    def stream(self, documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+
+EXPORTERS: Dict[ExportFormat, Type[Exporter]] = {}
+
+def register_exporter(exporter_class: Type[Exporter]) -> Type[Exporter]:
+    """Class decorator adding an exporter to the registry."""
+    EXPORTERS[exporter_class.format] = exporter_class
+    return exporter_class
+
+def get_exporter(
+    export_format: ExportFormat,
+    fieldnames: Sequence[str],
+    batch_size: int = 500,
+    field_types: Optional[Dict[str, type]] = None,
+) -> Exporter:
+    try:
+        return EXPORTERS[export_format](fieldnames, batch_size=batch_size, field_types=field_types)
+    except KeyError:
+        raise ValueError(f"No exporter registered for {export_format.value}")
+
+def export_response(
+    exporter: Exporter,
+    documents: AsyncIterator[Dict[str, Any]],
+    filename_base: str,
+) -> StreamingResponse:
+    """Wrap an exporter's output in a downloadable streaming response."""
+    return StreamingResponse(
+        exporter.stream(documents),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename_base}.{exporter.extension}"}
+    )
+
+
+@register_exporter
+class CSVExporter(Exporter):
+    format = ExportFormat.CSV
+    media_type = "text/csv"
+    extension = "csv"
+
+    def stream(self, documents):
+        return stream_csv(documents, self.fieldnames, batch_size=self.batch_size)
+
+
+@register_exporter
+class NDJSONExporter(Exporter):
+    format = ExportFormat.NDJSON
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    async def stream(self, documents):
+        async for batch in _batches(documents, self.batch_size):
+            # Same rendering as the JSON API, e.g. ISO-8601 dates
+            yield b"".join(dumps(document) + b"\n" for document in batch)
+
+
+@register_exporter
+class XLSXExporter(Exporter):
+    format = ExportFormat.EXCEL
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+    memory_profile = "spooled"
+    chunk_size = 64 * 1024
+
+    async def stream(self, documents):
+        from openpyxl import Workbook
+
+        # Write-only workbooks spool rows to disk instead of keeping cells in memory
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Export")
+        sheet.append(self.fieldnames)
+
+        async for batch in _batches(documents, self.batch_size):
+            for document in batch:
+                sheet.append([_scalar(document.get(field)) for field in self.fieldnames])
+
+        with tempfile.TemporaryFile() as output:
+            await asyncio.to_thread(workbook.save, output)
+            output.seek(0)
+            while chunk := output.read(self.chunk_size):
+                yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object collecting bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+@register_exporter
+class ParquetExporter(Exporter):
+    format = ExportFormat.PARQUET
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+    memory_profile = "row_group"
+
+    async def stream(self, documents):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {
+            bool: pa.bool_(),
+            int: pa.int64(),
+            float: pa.float64(),
+            datetime: pa.timestamp("us"),
+        }
+        # The schema comes from the declared types, never from the data: a
+        # column that is empty in one batch must still accept the next one.
+        # Undeclared fields are strings.
+        schema = pa.schema([
+            pa.field(field, arrow_types.get(self.field_types.get(field), pa.string()))
+            for field in self.fieldnames
+        ])
+        converters = [
+            (field.name, _text if pa.types.is_string(field.type) else _scalar)
+            for field in schema
+        ]
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+
+        # One row group per batch
+        async for batch in _batches(documents, self.batch_size):
+            columns = {
+                name: [convert(document.get(name)) for document in batch]
+                for name, convert in converters
+            }
+            writer.write_table(pa.table(columns, schema=schema))
+            yield sink.drain()
+
+        writer.close()
+        yield sink.drain()
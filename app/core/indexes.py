@@ -0,0 +1,117 @@
+"""Declarative index manifest for the collections used by the routers.
+
+``ensure_indexes`` applies the manifest idempotently (``createIndexes`` is a
+no-op for indexes that already exist) and is run at startup and by
+``scripts/init_collections.py``. ``find_collection_scans`` explains the
+query shapes the routers issue and reports the ones that fall back to a
+collection scan.
+"""
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.crud import NORMALIZED_SUFFIX, SEARCH_FIELDS
+from app.core.logging import logger
+from app.core.refresh_tokens import REFRESH_TOKENS_COLLECTION
+
+
+def _catalog_indexes() -> List[IndexModel]:
+    # Lowercase twins back the prefix search, the text index the text search
+    return [
+        *(IndexModel([(f"{field}{NORMALIZED_SUFFIX}", ASCENDING)]) for field in SEARCH_FIELDS),
+        IndexModel([(field, TEXT) for field in SEARCH_FIELDS], name="search_text"),
+    ]
+
+INDEX_MANIFEST: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("created_at", ASCENDING)]),
+    ],
+    "brand": _catalog_indexes(),
+    "merchant": _catalog_indexes(),
+    "tickets": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    REFRESH_TOKENS_COLLECTION: [
+        IndexModel([("token_hash", ASCENDING)], unique=True),
+        IndexModel([("family_id", ASCENDING)]),
+        IndexModel([("username", ASCENDING)]),
+        # Expired sessions are deleted by the TTL monitor
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
+
+# Representative query shapes per collection, used to check index coverage
+PROBE_QUERIES: Dict[str, List[Dict[str, Any]]] = {
+    "users": [
+        {"username": "probe"},
+        {"email": "probe@example.com"},
+    ],
+    "brand": [
+        {"name_lower": {"$regex": "^probe"}},
+        {"manufacturer_lower": {"$regex": "^probe"}},
+        {"$text": {"$search": "probe"}},
+    ],
+    "merchant": [
+        {"name_lower": {"$regex": "^probe"}},
+        {"$text": {"$search": "probe"}},
+    ],
+    "tickets": [
+        {"id": "00000000-0000-0000-0000-000000000000"},
+        {"status": "open"},
+    ],
+    REFRESH_TOKENS_COLLECTION: [
+        {"token_hash": "probe"},
+        {"family_id": "probe"},
+    ],
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Create every index in the manifest and return their names by collection.
+
+    A conflicting index on one collection (e.g. same keys, different options)
+    is logged and does not stop the others from being applied.
+    """
+    applied = {}
+    for collection_name, indexes in INDEX_MANIFEST.items():
+        try:
+            applied[collection_name] = await db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            logger.error("Could not apply indexes on %s: %s", collection_name, e)
+    return applied
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Collect every stage name in an explain plan, however deeply nested."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def find_collection_scans(db: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+    """Explain every probe query and return those whose winning plan has a COLLSCAN."""
+    scans = []
+    for collection_name, queries in PROBE_QUERIES.items():
+        for query in queries:
+            try:
+                explain = await db[collection_name].find(query).explain()
+            except OperationFailure as e:
+                # e.g. $text without a text index
+                scans.append({"collection": collection_name, "query": query, "error": str(e)})
+                continue
+            winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+            if "COLLSCAN" in _plan_stages(winning_plan):
+                scans.append({"collection": collection_name, "query": query, "stage": "COLLSCAN"})
+    return scans
@@ -0,0 +1,99 @@
+"""Deferred ``last_login`` writes.
+
+Logins record the timestamp in ``last_login_buffer`` instead of awaiting an
+``update_one``. A background task started in the lifespan flushes the buffer
+with one unordered ``bulk_write`` every ``last_login_flush_interval_seconds``,
+or sooner once ``last_login_max_pending`` users are waiting. The lifespan
+runs a final flush on shutdown. A user who logs in several times between
+flushes costs a single write with the latest timestamp.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.core.auth import user_cache
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class LastLoginBuffer:
+    def __init__(self, interval: float, max_pending: int):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, datetime] = {}
+        self._full: Optional[asyncio.Event] = None
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def record(self, username: str, when: Optional[datetime] = None) -> None:
+        self._pending[username] = when or datetime.utcnow().replace(microsecond=0)
+        if len(self._pending) >= self.max_pending and self._full is not None:
+            self._full.set()
+
+    async def flush(self, db: AsyncIOMotorDatabase) -> int:
+        """Write every pending timestamp and return how many users were updated.
+
+        On failure, or if the flush is cancelled mid-write, the timestamps go
+        back into the buffer for the next flush unless a newer login was
+        recorded in the meantime. Rewriting a timestamp is idempotent.
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        try:
+            await db.users.bulk_write(
+                [
+                    UpdateOne({"username": username}, {"$set": {"last_login": when}})
+                    for username, when in pending.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.warning("Could not flush %d last_login updates: %s", len(pending), e)
+            self._requeue(pending)
+            return 0
+        except BaseException:
+            # Cancelled during shutdown: keep the batch for the final flush
+            self._requeue(pending)
+            raise
+
+        for username in pending:
+            user_cache.invalidate(username)
+        self.flushed += len(pending)
+        return len(pending)
+
+    def _requeue(self, pending: Dict[str, datetime]) -> None:
+        for username, when in pending.items():
+            self._pending.setdefault(username, when)
+
+    async def run(self, db: AsyncIOMotorDatabase) -> None:
+        """Flush periodically until cancelled."""
+        self._full = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._full.clear()
+                await self.flush(db)
+        finally:
+            self._full = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+last_login_buffer = LastLoginBuffer(
+    interval=settings.last_login_flush_interval_seconds,
+    max_pending=settings.last_login_max_pending,
+)
@@ -1,9 +1,25 @@
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
+import re
 import sys
+import uuid
+from contextvars import ContextVar
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 import os
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Request id of the request being handled, attached to every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+NO_REQUEST_ID = "-"
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_record = {
@@ -13,37 +29,93 @@ class JSONFormatter(logging.Formatter):
             "module": record.module,
             "function": record.funcName,
         }
-        if hasattr(record, 'request_id'):
+        if getattr(record, 'request_id', NO_REQUEST_ID) != NO_REQUEST_ID:
             log_record["request_id"] = record.request_id
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
         return json.dumps(log_record)
 
+class RequestIdFilter(logging.Filter):
+    """Copy the current request id onto the record before it leaves the request's context."""
+    def filter(self, record):
+        record.request_id = request_id_var.get() or NO_REQUEST_ID
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep one in ``every`` INFO/DEBUG records per call site; warnings and above always pass."""
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._seen: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        if not self.every:
+            return False
+        site = (record.pathname, record.lineno)
+        seen = self._seen.get(site, 0)
+        self._seen[site] = seen + 1
+        return seen % self.every == 0
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener thread without formatting them first.
+
+    The stock ``prepare`` formats the message on the calling thread; the
+    queue is in-process, so records can go through as is and the ``%`` args
+    are only interpolated by the listener. Records are dropped, and counted,
+    when the queue is full rather than blocking the caller.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
 # Create logs directory if it doesn't exist
 if not os.path.exists("logs"):
     os.makedirs("logs")
 
-# Configure logging based on environment
+# Configure the output handlers based on environment; they run on the
+# listener thread, so formatting and I/O stay off the event loop
 if os.getenv("ENVIRONMENT") == "production":
     # In production, use JSON logging to stdout for GCP
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JSONFormatter())
-    logging.basicConfig(
-        level=logging.INFO,
-        handlers=[handler]
-    )
+    output_handlers = [handler]
 else:
     # In development, use both file and console logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            # Console handler
-            logging.StreamHandler(),
-            # File handler with daily rotation
-            logging.FileHandler(f"logs/api_{datetime.now().strftime('%Y-%m-%d')}.log")
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s')
+    output_handlers = [
+        # Console handler
+        logging.StreamHandler(),
+        # File handler with daily rotation
+        logging.FileHandler(f"logs/api_{datetime.now().strftime('%Y-%m-%d')}.log")
+    ]
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+
+log_queue = queue.Queue(maxsize=settings.log_queue_size)
+queue_handler = NonBlockingQueueHandler(log_queue)
+queue_handler.addFilter(RequestIdFilter())
+queue_handler.addFilter(SamplingFilter(settings.log_sample_rate))
+
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[queue_handler]
+)
+
+listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+listener.start()
+# Drain the queue on interpreter exit
+atexit.register(listener.stop)
 
 # Create logger
 logger = logging.getLogger("filler-api")
@@ -51,4 +123,38 @@ logger = logging.getLogger("filler-api")
 def log_auth_attempt(username: str, success: bool, ip: str = None):
     """Log authentication attempts"""
     status = "successful" if success else "failed"
-    logger.info(f"Authentication {status} for user {username} from IP {ip}") 
\ No newline at end of file
+    logger.info("Authentication %s for user %s from IP %s", status, username, ip)
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+class RequestIdMiddleware:
+    """Take the request id from ``X-Request-ID`` (or generate one), bind it for
+    logging and echo it on the response."""
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,215 @@
+"""Request timing and hot-path instrumentation.
+
+``TimingMiddleware`` times every HTTP request into a latency histogram per
+method and route template. Each request also gets a phase accumulator in a
+context variable. ``track("auth")`` / ``track("serialization")`` blocks add
+to it, and ``MongoCommandListener`` adds the server round trip of every
+command run on the request's behalf (Motor copies the context into its
+executor threads). Phases are observed into their own histograms when the
+request ends. They can overlap, e.g. the users lookup counts as both auth
+and mongo time.
+
+The listener also keeps per-collection command counts and durations, and
+``metrics.render()`` writes everything in the Prometheus text format.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_phases", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus expects it."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    def __init__(self):
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, **labels: str) -> Histogram:
+        key = tuple(sorted(labels.items()))
+        series = self._histograms.setdefault(name, {})
+        if key not in series:
+            with self._lock:
+                series.setdefault(key, Histogram())
+                self._help[name] = help_text
+        return series[key]
+
+    def inc(self, name: str, help_text: str, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+            self._help[name] = help_text
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self, gauges: Optional[Dict[str, Dict[Labels, float]]] = None) -> str:
+        """Prometheus text exposition of every series, plus ``gauges``."""
+        lines: List[str] = []
+        for name, series in sorted(self._histograms.items()):
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(series.items()):
+                bounds = [*histogram.buckets, "+Inf"]
+                for bound, count in zip(bounds, [*histogram.counts, histogram.count]):
+                    bucket_labels = _format_labels(labels, 'le="%s"' % bound)
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, series in sorted(self._counters.items()):
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        for name, series in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add ``seconds`` to ``phase`` for the current request, if there is one."""
+    phases = _request_phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+@contextmanager
+def track(phase: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Feeds per-collection command metrics and the request's mongo phase."""
+
+    def __init__(self):
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        target = event.command.get(event.command_name)
+        # getMore names the cursor id; its collection is a separate field
+        collection = event.command.get("collection") if event.command_name == "getMore" else target
+        self._collections[event.request_id] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome: str) -> None:
+        collection = self._collections.pop(event.request_id, "")
+        seconds = event.duration_micros / 1e6
+        labels = {"collection": collection, "command": event.command_name}
+        metrics.histogram(
+            "mongo_command_duration_seconds", "MongoDB command round trip time", **labels
+        ).observe(seconds)
+        if outcome == "failed":
+            metrics.inc("mongo_command_failures_total", "Failed MongoDB commands", **labels)
+        record_phase("mongo", seconds)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, "succeeded")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, "failed")
+
+mongo_command_listener = MongoCommandListener()
+
+
+# Label for requests that matched no route (404s, mounted apps), whose raw
+# paths would otherwise create one series each
+UNMATCHED_ROUTE = "<unmatched>"
+
+def route_path(scope: Scope) -> str:
+    """Matched route template, so /brand/{brand_id} is one series, not one per id."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class TimingMiddleware:
+    """Time requests and their phases; streamed bodies count until the last chunk."""
+
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        token = _request_phases.set(phases)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_phases.reset(token)
+            route = route_path(scope)
+            method = scope["method"]
+            metrics.histogram(
+                "http_request_duration_seconds", "HTTP request latency", method=method, route=route
+            ).observe(elapsed)
+            metrics.inc(
+                "http_requests_total", "HTTP requests", method=method, route=route, status=str(status_code)
+            )
+            for phase, seconds in phases.items():
+                metrics.histogram(
+                    "http_request_phase_duration_seconds",
+                    "Time spent per request phase",
+                    method=method,
+                    route=route,
+                    phase=phase,
+                ).observe(seconds)
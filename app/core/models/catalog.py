@@ -0,0 +1,108 @@
+from dataclasses import field, fields, make_dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Type, Union, get_args, get_origin
+from pydantic import BaseModel, ConfigDict
+
+# Typed views of catalog documents. Documents may carry more fields than the
+# ones declared here, so extra fields are kept rather than rejected.
+
+class Brand(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: Optional[str] = None
+    name: str
+    manufacturer: Optional[str] = None
+    country: Optional[str] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    website: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class Merchant(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: Optional[str] = None
+    name: str
+    manufacturer: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+    website: Optional[str] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class Record:
+    """Mixin for slotted catalog records built from Mongo documents.
+
+    Records hold their declared fields in slots, which keeps per-document
+    memory small and doubles as the list of fields that may be projected.
+    Undeclared fields, which the models allow, are kept in ``extras``. Records
+    are generated from the Pydantic models by ``record_type`` so the two
+    cannot drift apart.
+    """
+    __slots__ = ()
+
+    # Record fields that are not document fields
+    _meta_fields = ("id", "extras")
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        return tuple(f.name for f in fields(cls) if f.name not in cls._meta_fields)
+
+    @classmethod
+    def field_types(cls) -> Dict[str, type]:
+        """Declared type of each field, with ``Optional`` unwrapped."""
+        types = {}
+        for record_field in fields(cls):
+            if record_field.name in cls._meta_fields:
+                continue
+            annotation = record_field.type
+            if get_origin(annotation) is Union:
+                annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+            types[record_field.name] = annotation
+        return types
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "Record":
+        declared = cls.field_names()
+        record = cls(**{name: document[name] for name in declared if name in document})
+        record.extras = {
+            name: value for name, value in document.items()
+            if name != "_id" and name not in declared
+        }
+        if "_id" in document:
+            record.id = str(document["_id"])
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields that are set, skipping the ones left as None."""
+        values = (
+            (record_field.name, getattr(self, record_field.name))
+            for record_field in fields(self)
+            if record_field.name != "extras"
+        )
+        data = {name: value for name, value in values if value is not None}
+        data.update(self.extras)
+        return data
+
+def record_type(model: Type[BaseModel]) -> Type[Record]:
+    """Build the slotted record class for ``model`` from its declared fields.
+
+    Every record field is optional, as projections can leave any of them out.
+    """
+    record = make_dataclass(
+        f"{model.__name__}Record",
+        [
+            *((name, Optional[info.annotation], None) for name, info in model.model_fields.items()),
+            ("extras", Dict[str, Any], field(default_factory=dict)),
+        ],
+        bases=(Record,),
+        slots=True,
+    )
+    record.__module__ = __name__
+    return record
+
+BrandRecord = record_type(Brand)
+MerchantRecord = record_type(Merchant)
@@ -4,16 +4,18 @@ from pydantic import BaseModel
 T = TypeVar('T')
 
 class PaginationModel(BaseModel):
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
 
 class BaseResponseModel(BaseModel, Generic[T]):
     status: str = "success"
     message: Optional[str] = None
     data: Optional[T] = None
     pagination: Optional[PaginationModel] = None
+    next_cursor: Optional[str] = None
+    search_strategy: Optional[str] = None
 
 class EntityResponseModel(BaseResponseModel, Generic[T]):
     """Generic response model for entity data with pagination"""
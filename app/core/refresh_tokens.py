@@ -0,0 +1,105 @@
+"""Rotating refresh tokens stored in Mongo.
+
+A refresh token is a random 256-bit string. Only its SHA-256 digest is
+stored: the token has far too much entropy to brute force, so a cheap
+hash is enough and refreshing never runs bcrypt.
+
+Each use rotates the token. The old document is atomically marked revoked
+and a new token joins the same family. Presenting a token that was already
+rotated means it leaked, so the whole family is revoked and the client has
+to log in again. Rotated tokens keep the expiry of the token they replace,
+so a session ends ``refresh_token_expire_days`` after login however often it
+is refreshed. Expired documents are removed by the TTL index on
+``expires_at``.
+"""
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.exceptions import AuthenticationException
+from app.core.logging import logger
+
+REFRESH_TOKENS_COLLECTION = "refresh_tokens"
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(
+    db: AsyncIOMotorDatabase,
+    username: str,
+    family_id: Optional[str] = None,
+    expires_at: Optional[datetime] = None,
+) -> str:
+    """Store a new refresh token for ``username`` and return it.
+
+    A new session starts without ``family_id`` and ``expires_at``; rotations
+    pass both on from the spent token.
+    """
+    token = secrets.token_urlsafe(32)
+    now = datetime.now(timezone.utc)
+    await db[REFRESH_TOKENS_COLLECTION].insert_one({
+        "token_hash": hash_refresh_token(token),
+        "username": username,
+        "family_id": family_id or uuid.uuid4().hex,
+        "created_at": now,
+        "expires_at": expires_at or now + timedelta(days=settings.refresh_token_expire_days),
+        "revoked_at": None,
+    })
+    return token
+
+async def rotate_refresh_token(db: AsyncIOMotorDatabase, token: str) -> Tuple[str, str]:
+    """Spend ``token`` and return ``(username, new_refresh_token)``.
+
+    Raises ``AuthenticationException`` for unknown, expired or reused tokens,
+    and for tokens of users that no longer exist.
+    """
+    collection = db[REFRESH_TOKENS_COLLECTION]
+    token_hash = hash_refresh_token(token)
+    now = datetime.now(timezone.utc)
+
+    # Revoking in the same operation that checks validity makes each token
+    # single use, even with concurrent refreshes
+    document = await collection.find_one_and_update(
+        {"token_hash": token_hash, "revoked_at": None, "expires_at": {"$gt": now}},
+        {"$set": {"revoked_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if document is None:
+        spent = await collection.find_one({"token_hash": token_hash, "revoked_at": {"$ne": None}})
+        if spent is not None:
+            logger.warning("Refresh token reuse detected for user %s, revoking the session", spent["username"])
+            await revoke_family(db, spent["family_id"])
+        raise AuthenticationException(detail="Invalid or expired refresh token")
+
+    username = document["username"]
+    if await db.users.find_one({"username": username}, {"_id": 1}) is None:
+        logger.warning("Refresh token presented for unknown user %s, revoking the session", username)
+        await revoke_family(db, document["family_id"])
+        raise AuthenticationException(detail="Invalid or expired refresh token")
+
+    new_token = await issue_refresh_token(
+        db, username, family_id=document["family_id"], expires_at=document["expires_at"]
+    )
+    return username, new_token
+
+async def revoke_family(db: AsyncIOMotorDatabase, family_id: str) -> None:
+    await db[REFRESH_TOKENS_COLLECTION].update_many(
+        {"family_id": family_id, "revoked_at": None},
+        {"$set": {"revoked_at": datetime.now(timezone.utc)}},
+    )
+
+async def revoke_refresh_token(db: AsyncIOMotorDatabase, token: str) -> None:
+    """Log out: revoke the session ``token`` belongs to. Unknown tokens are ignored."""
+    document = await db[REFRESH_TOKENS_COLLECTION].find_one(
+        {"token_hash": hash_refresh_token(token)}, {"family_id": 1}
+    )
+    if document is not None:
+        await revoke_family(db, document["family_id"])
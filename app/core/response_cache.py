@@ -0,0 +1,169 @@
+"""Response cache for the catalog list endpoints.
+
+Serialized response bodies are cached per collection and query parameters
+in an in-process LRU tier, optionally backed by a shared Redis tier so
+workers can reuse each other's pages. Every cached body carries a strong
+ETag, and ``conditional_response`` answers ``If-None-Match`` revalidations
+with a bodiless 304.
+
+Entries are dropped when ``MongoManager.create`` writes to a collection, or
+when ``watch_for_changes`` sees a change event (this needs a replica set).
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.logging import logger
+
+CacheKey = Tuple[str, str]
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class RedisCacheBackend:
+    """Shared cache tier on Redis; needs the optional ``redis`` package."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "filler-api:responses:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: CacheKey) -> str:
+        collection, params = key
+        return f"{self.prefix}{collection}:{hashlib.sha1(params.encode()).hexdigest()}"
+
+    async def get(self, key: CacheKey) -> Optional[bytes]:
+        return await self._redis.get(self._key(key))
+
+    async def set(self, key: CacheKey, body: bytes) -> None:
+        await self._redis.set(self._key(key), body, px=int(self.ttl * 1000))
+
+    async def invalidate(self, collection: str) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"{self.prefix}{collection}:*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class ResponseCache:
+    """Two-tier cache of serialized response bodies and their ETags."""
+
+    def __init__(self, local: TTLCache, shared: Optional[RedisCacheBackend] = None):
+        self.local = local
+        self.shared = shared
+
+    @staticmethod
+    def make_key(collection: str, **params: Any) -> CacheKey:
+        return collection, json.dumps(params, sort_keys=True, default=str)
+
+    async def get(self, key: CacheKey) -> Optional[Tuple[bytes, str]]:
+        entry = self.local.get(key)
+        if entry is not None or self.shared is None:
+            return entry
+
+        try:
+            body = await self.shared.get(key)
+        except Exception as e:
+            logger.warning("Shared response cache unavailable: %s", e)
+            return None
+        if body is None:
+            return None
+
+        entry = (body, make_etag(body))
+        self.local.set(key, entry)
+        return entry
+
+    async def set(self, key: CacheKey, body: bytes) -> str:
+        etag = make_etag(body)
+        self.local.set(key, (body, etag))
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, body)
+            except Exception as e:
+                logger.warning("Shared response cache unavailable: %s", e)
+        return etag
+
+    async def invalidate(self, collection: str) -> None:
+        self.local.invalidate_matching(lambda key: key[0] == collection)
+        if self.shared is not None:
+            try:
+                await self.shared.invalidate(collection)
+            except Exception as e:
+                logger.warning("Shared response cache unavailable: %s", e)
+
+
+def _create_response_cache() -> ResponseCache:
+    shared = None
+    if settings.response_cache_redis_url and settings.response_cache_shared_ttl_seconds > 0:
+        shared = RedisCacheBackend(
+            settings.response_cache_redis_url,
+            ttl=settings.response_cache_shared_ttl_seconds,
+        )
+    return ResponseCache(
+        local=TTLCache(
+            maxsize=settings.response_cache_max_size,
+            ttl=settings.response_cache_ttl_seconds,
+        ),
+        shared=shared,
+    )
+
+response_cache = _create_response_cache()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    media_type: str = "application/json",
+) -> Response:
+    """Return ``body`` with its ETag, or a 304 when the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+async def watch_for_changes(db: AsyncIOMotorDatabase, collections: Iterable[str]) -> None:
+    """Invalidate cached responses whenever a watched collection changes.
+
+    Runs until cancelled and reconnects after errors, backing off up to a
+    minute. Change streams need a replica set or sharded cluster.
+    """
+    collections = list(collections)
+    pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+    delay = 1
+    while True:
+        try:
+            async with db.watch(pipeline) as stream:
+                delay = 1
+                async for change in stream:
+                    await response_cache.invalidate(change["ns"]["coll"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Response cache change stream failed, retrying in %ss: %s", delay, e)
+            # Changes may be missed while disconnected, so start from scratch
+            for collection in collections:
+                await response_cache.invalidate(collection)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
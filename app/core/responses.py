@@ -0,0 +1,67 @@
+"""Fast JSON rendering for list endpoints.
+
+List routes build their payload from raw BSON documents and serialize it in
+a single pass with orjson (falling back to the standard library where it
+is not installed), instead of validating every document into a Pydantic
+model and serializing it again through ``response_model``.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Type
+from uuid import UUID
+
+from bson import Decimal128, ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.metrics import track
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a core dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the BSON and Python types JSON has no native form for."""
+    if isinstance(value, (ObjectId, UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def render_model(model_class: Type[BaseModel], **fields: Any) -> bytes:
+    """Serialize a response as ``model_class`` would, without validating it.
+
+    Unset fields take the model defaults. With ``fast_json_responses`` off,
+    the payload goes through the model as before.
+    """
+    with track("serialization"):
+        if not settings.fast_json_responses:
+            return model_class(**fields).model_dump_json().encode("utf-8")
+
+        payload: Dict[str, Any] = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in model_class.model_fields.items()
+        }
+        payload.update(fields)
+        return dumps(payload)
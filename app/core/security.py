@@ -1,6 +1,13 @@
 from passlib.context import CryptContext
 from pydantic import BaseModel, validator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
 import re
+import time
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -34,4 +41,91 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     if not validate_password(password):
         raise ValueError("Password does not meet complexity requirements")
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so running it on worker threads keeps the event
+    loop responsive. Once ``max_workers + max_queue`` calls are in flight,
+    further calls are rejected with a 503 instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceUnavailableException(detail="Password service is busy, please retry")
+
+        submitted = time.perf_counter()
+        timings = {}
+
+        def timed_call():
+            started = time.perf_counter()
+            timings["wait"] = started - submitted
+            try:
+                return func(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), timed_call)
+        finally:
+            self._in_flight -= 1
+            if timings:
+                self.completed += 1
+                self.queue_wait_seconds += timings["wait"]
+                self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, timings["wait"])
+                self.hash_seconds += timings.get("run", 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_seconds_total": self.queue_wait_seconds,
+            "queue_wait_seconds_max": self.max_queue_wait_seconds,
+            "hash_seconds_total": self.hash_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash on the hashing pool."""
+    if not validate_password(password):
+        raise ValueError("Password does not meet complexity requirements")
+    return await password_pool.run(pwd_context.hash, password)
@@ -0,0 +1,93 @@
+"""JWT encoding backends and the verified-token cache.
+
+``jwt_backend`` selects python-jose (the default) or PyJWT (optional ``jwt``
+extra), whichever is faster with the deployed crypto libraries. Either way
+callers only see ``TokenError``.
+
+``TokenVerifier`` checks each token's signature and claims once, then keeps
+the claims in a ``TTLCache`` keyed by the token's SHA-256 digest until the
+sooner of ``token_cache_ttl_seconds`` and the token's ``exp``, so repeated
+requests with the same bearer token skip the HMAC and claims parsing.
+"""
+import hashlib
+import time
+from typing import Any, Dict, List
+
+from app.core.cache import TTLCache
+
+
+class TokenError(Exception):
+    """The token is malformed, badly signed or expired."""
+
+
+class JoseBackend:
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as e:
+            raise TokenError(str(e)) from e
+
+
+class PyJWTBackend:
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+
+        self._jwt = jwt
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+JWT_BACKENDS = {backend.name: backend for backend in (JoseBackend, PyJWTBackend)}
+
+def get_jwt_backend(name: str):
+    try:
+        return JWT_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {name}")
+
+
+class TokenVerifier:
+    def __init__(self, backend, key: str, algorithm: str, cache: TTLCache):
+        self.backend = backend
+        self.key = key
+        self.algorithm = algorithm
+        self.cache = cache
+
+    def encode(self, claims: Dict[str, Any], expires_in: float) -> str:
+        # An integer NumericDate skips the datetime conversion in the backends
+        return self.backend.encode(
+            {**claims, "exp": int(time.time() + expires_in)}, self.key, self.algorithm
+        )
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims, raising ``TokenError`` if it is not valid."""
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self.cache.get(digest)
+        if claims is not None:
+            return claims
+
+        claims = self.backend.decode(token, self.key, algorithms=[self.algorithm])
+        expires_at = claims.get("exp")
+        ttl = None if expires_at is None else float(expires_at) - time.time()
+        self.cache.set(digest, claims, ttl=ttl)
+        return claims
@@ -1,7 +1,9 @@
 """Main FastAPI application module."""
 from datetime import datetime
 from pathlib import Path
+import asyncio
 import logging
+import time
 import warnings
 from typing import Any
 
@@ -15,9 +17,18 @@ from app.core.database import (
     connect_to_mongo,
     close_mongo_connection,
     get_database,
+    warm_up_pool,
 )
-from app.routes import auth, brand, merchant, test_axione
+from app.routes import auth, brand, merchant, metrics, test_axione
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
 from app.core.description import get_api_description
+from app.core.indexes import ensure_indexes
+from app.core.last_login import last_login_buffer
+from app.core.logging import RequestIdMiddleware
+from app.core.metrics import TimingMiddleware
+from app.core.response_cache import response_cache, watch_for_changes
+from app.core.security import password_pool
 
 # Suppress the bcrypt warning
 warnings.filterwarnings("ignore", message=".*error reading bcrypt version.*")
@@ -29,21 +40,52 @@ logging.getLogger("passlib.handlers.bcrypt").setLevel(logging.ERROR)
 async def lifespan(app: FastAPI):
     """Lifespan event handler for database connection."""
     # Startup
+    started = time.perf_counter()
     try:
         await connect_to_mongo()
         db = await get_database()
         result = await db.command("ping")
         if result.get("ok") == 1:
             logging.info("Successfully connected to MongoDB")
+            connections = await warm_up_pool()
+            logging.info("Warmed up %d MongoDB connections", connections)
+            if settings.ensure_indexes_on_startup:
+                await ensure_indexes(db)
+                logging.info("Indexes are up to date")
         else:
             logging.error("Failed to connect to MongoDB: Ping command failed")
     except Exception as e:
         logging.error("Failed to connect to MongoDB: %s", str(e), exc_info=True)
+
+    # Invalidate cached catalog pages on writes from any process
+    change_watcher = None
+    if settings.response_cache_change_streams:
+        change_watcher = asyncio.create_task(
+            watch_for_changes(await get_database(), ["brand", "merchant"])
+        )
+
+    # Write buffered last_login updates in the background
+    last_login_flusher = None
+    database = await get_database()
+    if database is not None:
+        last_login_flusher = asyncio.create_task(last_login_buffer.run(database))
+
+    app.state.startup_seconds = time.perf_counter() - started
+    logging.info("Startup completed in %.1f ms", app.state.startup_seconds * 1000)
     
     yield
     
     # Shutdown
+    if change_watcher is not None:
+        change_watcher.cancel()
+    if last_login_flusher is not None:
+        last_login_flusher.cancel()
+        await asyncio.gather(last_login_flusher, return_exceptions=True)
+        await last_login_buffer.flush(database)
+    if response_cache.shared is not None:
+        await response_cache.shared.close()
     await close_mongo_connection()
+    password_pool.shutdown()
 
 app = FastAPI(
     title="Dermal Filler Wiki API <甄真>",
@@ -70,6 +112,13 @@ app = FastAPI(
     openapi_url="/openapi.json",
 )
 
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+# Added after compression so it wraps it and its timings include compression
+if settings.metrics_enabled:
+    app.add_middleware(TimingMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
 # Mount static files directory
 current_dir = Path(__file__).parent
 images_dir = current_dir / "images"
@@ -80,6 +129,8 @@ app.include_router(auth.router)
 app.include_router(brand.router)
 app.include_router(merchant.router)
 app.include_router(test_axione.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
 @app.get("/", include_in_schema=False)
 async def root() -> RedirectResponse:
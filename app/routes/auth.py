@@ -4,13 +4,20 @@ from datetime import timedelta, datetime
 from app.core.auth import (
     authenticate_user,
     create_access_token,
+    user_cache,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.core.last_login import last_login_buffer
 from app.core.logging import logger
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.core.crud import get_database
-from app.core.security import get_password_hash, validate_password
-from app.core.models.user import UserCreate, UserBase, Token
+from app.core.security import get_password_hash_async, validate_password
+from app.core.models.user import UserCreate, UserBase, Token, RefreshTokenRequest
+from app.core.refresh_tokens import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token
+)
 from pymongo.errors import DuplicateKeyError, ConnectionFailure
 
 # Change tags to "Auth" and add openapi_tags metadata
@@ -39,74 +46,76 @@ router = APIRouter(
 async def register_user(user_create: UserCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
     try:
         # Validate password
-        logger.info(f"Validating password for user: {user_create.username}")
+        logger.info("Validating password for user: %s", user_create.username)
         if not validate_password(user_create.password):
-            logger.warning(f"Password validation failed for user: {user_create.username}")
+            logger.warning("Password validation failed for user: %s", user_create.username)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password does not meet complexity requirements"
             )
         
         # Check if user exists
-        logger.info(f"Checking if username exists: {user_create.username}")
+        logger.info("Checking if username exists: %s", user_create.username)
         if await db.users.find_one({"username": user_create.username}):
-            logger.warning(f"Username already exists: {user_create.username}")
+            logger.warning("Username already exists: %s", user_create.username)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
         
         # Check if email exists
-        logger.info(f"Checking if email exists: {user_create.email}")
+        logger.info("Checking if email exists: %s", user_create.email)
         if await db.users.find_one({"email": user_create.email}):
-            logger.warning(f"Email already exists: {user_create.email}")
+            logger.warning("Email already exists: %s", user_create.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Create user document
-        logger.info(f"Creating user document for: {user_create.username}")
+        logger.info("Creating user document for: %s", user_create.username)
         user_dict = {
             "username": user_create.username,
             "email": user_create.email,
-            "hashed_password": get_password_hash(user_create.password),
+            "hashed_password": await get_password_hash_async(user_create.password),
             "created_at": datetime.utcnow().replace(microsecond=0),
             "last_login": None
         }
         
         try:
-            logger.info(f"Inserting user into database: {user_create.username}")
+            logger.info("Inserting user into database: %s", user_create.username)
             result = await db.users.insert_one(user_dict)
-            logger.info(f"User inserted with ID: {result.inserted_id}")
+            logger.info("User inserted with ID: %s", result.inserted_id)
+            user_cache.invalidate(user_create.username)
         except DuplicateKeyError as e:
-            logger.error(f"DuplicateKeyError: {str(e)}")
+            logger.error("DuplicateKeyError: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username or email already exists"
             )
         except ConnectionFailure as e:
-            logger.error(f"ConnectionFailure: {str(e)}")
+            logger.error("ConnectionFailure: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Database connection error"
             )
         except Exception as e:
-            logger.error(f"Unexpected error during insert: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during insert: %s", e, exc_info=True)
             raise
             
-        logger.info(f"Fetching created user: {user_create.username}")
-        created_user = await db.users.find_one({"_id": result.inserted_id})
-        logger.info(f"User registered successfully: {user_create.username}")
+        logger.info("User registered successfully: %s", user_create.username)
         
-        # Return only username and email
+        # Return only username and email; the inserted document is what
+        # was sent, so there is no need to read it back
         return UserBase(
-            username=created_user["username"],
-            email=created_user["email"]
+            username=user_dict["username"],
+            email=user_dict["email"]
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error registering user {user_create.username}: {str(e)}", exc_info=True)
+        logger.error("Error registering user %s: %s", user_create.username, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not create user"
@@ -129,14 +138,42 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Update last_login
-    await db.users.update_one(
-        {"username": user.username},
-        {"$set": {"last_login": datetime.utcnow().replace(microsecond=0)}}
-    )
+    # Update last_login; written in bulk in the background, off the login path
+    last_login_buffer.record(user.username)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+    refresh_token = await issue_refresh_token(db, user.username)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/refresh",
+    response_model=Token,
+    summary="Refresh an access token",
+    description="Exchange a refresh token for a new access token and a new refresh token. "
+                "Each refresh token can be used once; reusing one ends the session."
+)
+async def refresh_access_token(
+    request: RefreshTokenRequest,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    # No password check here: the refresh token is verified by its hash
+    username, refresh_token = await rotate_refresh_token(db, request.refresh_token)
+    access_token = create_access_token(
+        data={"sub": username},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Log out",
+    description="Revoke the session the refresh token belongs to. "
+                "Access tokens already issued stay valid until they expire."
+)
+async def logout(
+    request: RefreshTokenRequest,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    await revoke_refresh_token(db, request.refresh_token) 
\ No newline at end of file
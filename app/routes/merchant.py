@@ -1,55 +1,40 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from app.core.crud import MongoManager
-from app.core.database import get_database
+from app.core.catalog import CatalogListParams, CatalogResource, catalog_list_params, get_catalog_item, list_catalog
+from app.core.models.catalog import Merchant, MerchantRecord
+from app.core.models.response import MerchantResponseModel
+from app.core.database import get_catalog_database
+from app.core.responses import FastJSONResponse
+from typing import List
 from app.core.logging import logger
 from app.core.auth import get_current_user
 from app.core.models.user import UserInDB
-from app.core.models.response import MerchantResponseModel
-from app.core.exceptions import DatabaseException
-from typing import List, Dict, Any
 
 router = APIRouter(prefix="/merchant", tags=["Merchant"])
 
-@router.get("/", response_model=MerchantResponseModel[List[Dict[Any, Any]]])
+MERCHANTS = CatalogResource(
+    collection="merchant",
+    record_type=MerchantRecord,
+    response_model=MerchantResponseModel,
+    title="Merchant",
+    plural="merchants",
+)
+
+@router.get("/", response_model=MerchantResponseModel[List[Merchant]], response_class=FastJSONResponse)
 async def get_merchants(
+    request: Request,
     current_user: UserInDB = Depends(get_current_user),
-    name: str = None,
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    params: CatalogListParams = Depends(catalog_list_params),
+    db: AsyncIOMotorDatabase = Depends(get_catalog_database)
 ):
-    logger.info(f"User {current_user.username} accessing merchants endpoint")
-    try:
-        logger.info(f"Fetching merchants - Page: {page}, Size: {page_size}, Filter: {name}")
-        
-        # Calculate skip based on page and page_size
-        skip: int = (page - 1) * page_size
-        limit: int = page_size
-        
-        crud = MongoManager("merchant")
-        
-        # Get total count for pagination metadata
-        total_count = await crud.count(db, name)
-        logger.info(f"Total merchants count: {total_count}")
-        
-        # Get paginated data
-        merchants = await crud.get_all(db, name, limit=limit, skip=skip)
-        
-        # Add pagination metadata
-        pagination = {
-            "total": total_count,
-            "page": page,
-            "page_size": page_size,
-            "pages": (total_count + page_size - 1) // page_size
-        }
-        
-        logger.info(f"Returning JSON response with {len(merchants)} merchants")
-        return MerchantResponseModel(
-            data=merchants,
-            pagination=pagination
-        )
+    logger.info("User %s accessing merchants endpoint", current_user.username)
+    return await list_catalog(request, MERCHANTS, params, db)
 
-    except Exception as e:
-        logger.error(f"Error fetching merchants: {str(e)}", exc_info=True)
-        raise DatabaseException(detail=f"Failed to fetch merchants: {str(e)}") 
\ No newline at end of file
+@router.get("/{merchant_id}", response_model=MerchantResponseModel[Merchant], response_class=FastJSONResponse)
+async def get_merchant(
+    merchant_id: str,
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_catalog_database)
+):
+    logger.info("User %s fetching merchant %s", current_user.username, merchant_id)
+    return await get_catalog_item(MERCHANTS, merchant_id, db)
@@ -0,0 +1,68 @@
+import secrets
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import token_verifier, user_cache
+from app.core.compression import compression_stats
+from app.core.config import settings
+from app.core.crud import count_cache
+from app.core.exceptions import AuthenticationException
+from app.core.last_login import last_login_buffer
+from app.core.metrics import Labels, metrics
+from app.core.response_cache import response_cache
+from app.core.security import password_pool
+
+
+def verify_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Require ``Bearer <metrics_token>`` when a metrics token is configured."""
+    if settings.metrics_token is None:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.metrics_token.encode()):
+        raise AuthenticationException(detail="Invalid metrics token")
+
+router = APIRouter(tags=["Metrics"], dependencies=[Depends(verify_metrics_token)])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def collect_gauges() -> Dict[str, Dict[Labels, float]]:
+    """Snapshot the caches, the hashing pool and compression as gauges."""
+    gauges: Dict[str, Dict[Labels, float]] = {}
+
+    def add(name: str, value: float, **labels: str) -> None:
+        gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    caches = {
+        "user": user_cache,
+        "token": token_verifier.cache,
+        "count": count_cache,
+        "response": response_cache.local,
+    }
+    for cache_name, cache in caches.items():
+        for stat, value in cache.stats().items():
+            add(f"cache_{stat}", value, cache=cache_name)
+
+    for stat, value in password_pool.stats().items():
+        add(f"password_pool_{stat}", value)
+
+    for stat, value in last_login_buffer.stats().items():
+        add(f"last_login_{stat}", value)
+
+    for entry in compression_stats.stats():
+        labels = {"route": entry["route"], "encoding": entry["encoding"]}
+        add("compression_responses", entry["responses"], **labels)
+        add("compression_bytes_in", entry["bytes_in"], **labels)
+        add("compression_bytes_out", entry["bytes_out"], **labels)
+        add("compression_cpu_seconds", entry["cpu_seconds"], **labels)
+        if entry["ratio"] is not None:
+            add("compression_ratio", entry["ratio"], **labels)
+
+    return gauges
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(metrics.render(collect_gauges()), media_type=PROMETHEUS_CONTENT_TYPE)
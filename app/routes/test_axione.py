@@ -1,14 +1,21 @@
+import asyncio
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List  # noqa: UP035
+from typing import Annotated, List, Literal  # noqa: UP035
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 
 from app.core.auth import get_current_user
-from app.core.database import get_database
+from app.core.config import settings
+from app.core.crud import parse_fields
+from app.core.database import get_database, get_tickets_read_database
 
 
 class TicketStatus(str, Enum):
@@ -33,34 +40,126 @@ class Ticket(BaseModel):
     status: TicketStatus
     created_at: datetime
 
+TICKET_FIELDS = tuple(Ticket.model_fields)
+
+def _ticket_projection(fields: str | None) -> dict | None:
+    """Inclusion projection for a sparse fieldset; ``id`` is always returned."""
+    requested = parse_fields(fields)
+    if not requested:
+        return None
+    unknown = [field for field in requested if field not in TICKET_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown ticket fields: {', '.join(unknown)}")
+    return {"_id": 0, "id": 1, **{field: 1 for field in requested}}
+
+class BulkTicketResult(BaseModel):
+    index: int
+    status: Literal["created", "failed", "skipped"]
+    ticket: Ticket | None = None
+    error: str | None = None
+
+class BulkTicketReport(BaseModel):
+    created: int
+    failed: int
+    skipped: int
+    results: list[BulkTicketResult]
+
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
+def _ticket_doc(ticket: TicketCreate) -> dict:
+    return {
+        "id": str(uuid4()),
+        "title": ticket.title,
+        "description": ticket.description,
+        "status": ticket.status.value,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+def _chunks(docs: list[dict], chunk_size: int) -> list[list[dict]]:
+    return [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+
+async def _insert_chunk(db: AsyncIOMotorDatabase, chunk: list[dict], ordered: bool) -> dict[int, str]:
+    """Insert one chunk with a single insert_many and return errors by chunk index."""
+    try:
+        await db["tickets"].insert_many(chunk, ordered=ordered)
+    except BulkWriteError as e:
+        return {
+            error["index"]: error.get("errmsg", "Write failed")
+            for error in e.details.get("writeErrors", [])
+        }
+    return {}
+
 @router.post("/", response_model=List[Ticket], status_code=status.HTTP_201_CREATED)  # noqa: UP006
 async def create_tickets(
     tickets: list[TicketCreate],
     db: AsyncIOMotorDatabase = Depends(get_database),  # noqa: B008
     user: dict = Depends(get_current_user),  # noqa: B008
 ):
-    created = []
-    for ticket in tickets:
-        ticket_id = uuid4()
-        ticket_doc = {
-            "id": str(ticket_id),
-            "title": ticket.title,
-            "description": ticket.description,
-            "status": ticket.status.value,
-            "created_at": datetime.now(timezone.utc),
-        }
-        await db["tickets"].insert_one(ticket_doc)
-        created.append(Ticket(**{**ticket_doc, "id": ticket_id}))
-    return created
+    docs = [_ticket_doc(ticket) for ticket in tickets]
+    for chunk in _chunks(docs, settings.ticket_bulk_chunk_size):
+        await db["tickets"].insert_many(chunk)
+    return [Ticket(**{**doc, "id": UUID(doc["id"])}) for doc in docs]
+
+@router.post("/bulk", response_model=BulkTicketReport)
+async def create_tickets_bulk(
+    tickets: list[TicketCreate],
+    db: AsyncIOMotorDatabase = Depends(get_database),  # noqa: B008
+    user: dict = Depends(get_current_user),  # noqa: B008
+    ordered: bool = Query(
+        True, description="Stop at the first failure instead of inserting every valid ticket"
+    ),
+    chunk_size: int | None = Query(
+        None, ge=1, le=10000, description="Tickets per insert_many call"
+    ),
+):
+    docs = [_ticket_doc(ticket) for ticket in tickets]
+    chunks = _chunks(docs, chunk_size or settings.ticket_bulk_chunk_size)
+
+    # Unordered chunks are independent, so they are sent concurrently
+    if ordered:
+        chunk_errors = []
+        for chunk in chunks:
+            errors = await _insert_chunk(db, chunk, ordered=True)
+            chunk_errors.append(errors)
+            if errors:
+                break
+    else:
+        chunk_errors = await asyncio.gather(
+            *(_insert_chunk(db, chunk, ordered=False) for chunk in chunks)
+        )
+
+    results = []
+    stopped = False
+    for chunk_index, chunk in enumerate(chunks):
+        errors = chunk_errors[chunk_index] if chunk_index < len(chunk_errors) else None
+        for offset, doc in enumerate(chunk):
+            index = chunk_index * len(chunks[0]) + offset
+            if errors is None or stopped:
+                results.append(BulkTicketResult(index=index, status="skipped"))
+            elif offset in errors:
+                results.append(BulkTicketResult(index=index, status="failed", error=errors[offset]))
+                stopped = ordered
+            else:
+                ticket = Ticket(**{**doc, "id": UUID(doc["id"])})
+                results.append(BulkTicketResult(index=index, status="created", ticket=ticket))
+
+    return BulkTicketReport(
+        created=sum(result.status == "created" for result in results),
+        failed=sum(result.status == "failed" for result in results),
+        skipped=sum(result.status == "skipped" for result in results),
+        results=results,
+    )
 
 @router.get("/", response_model=list[Ticket])
 async def list_tickets(
-    db: AsyncIOMotorDatabase = Depends(get_database),  # noqa: B008
+    db: AsyncIOMotorDatabase = Depends(get_tickets_read_database),  # noqa: B008
     title: str | None = Query(None, description="Filter by title substring"),
     status: TicketStatus | None = Query(None, description="Filter by status"),  # noqa: B008
     limit: int = Query(20, ge=1, le=100, description="Max items to return"),
+    fields: Annotated[
+        str | None,
+        Query(description="Comma separated fields to return, e.g. title,status"),
+    ] = None,
 ):
     query = {}
     if title:
@@ -68,6 +167,12 @@ async def list_tickets(
     if status:
         query["status"] = status.value
 
+    projection = _ticket_projection(fields)
+    if projection is not None:
+        # Partial documents would fail Ticket validation, so bypass the response model
+        cursor = db["tickets"].find(query, projection).limit(limit)
+        return JSONResponse(jsonable_encoder([doc async for doc in cursor]))
+
     cursor = db["tickets"].find(query).limit(limit)
     tickets = [Ticket(**{**doc, "id": UUID(doc["id"])}) async for doc in cursor]
     return tickets
@@ -75,7 +180,7 @@ async def list_tickets(
 @router.get("/{ticket_id}", response_model=Ticket)
 async def get_ticket(
     ticket_id: UUID,
-    db: AsyncIOMotorDatabase = Depends(get_database),  # noqa: B008
+    db: AsyncIOMotorDatabase = Depends(get_tickets_read_database),  # noqa: B008
     user: dict = Depends(get_current_user),  # noqa: B008
 ):
     doc = await db["tickets"].find_one({"id": str(ticket_id)})
@@ -92,13 +197,15 @@ async def update_ticket(
 ):
     update_data = {k: v for k, v in update.model_dump(exclude_unset=True).items() if v is not None}  # noqa: E501
     if update_data:
-        result = await db["tickets"].update_one(
+        doc = await db["tickets"].find_one_and_update(
             {"id": str(ticket_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
-            raise HTTPException(status_code=404, detail="Ticket not found")
-    doc = await db["tickets"].find_one({"id": str(ticket_id)})
+    else:
+        doc = await db["tickets"].find_one({"id": str(ticket_id)})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Ticket not found")
     return Ticket(**{**doc, "id": UUID(doc["id"])})
 
 @router.patch("/{ticket_id}/close", response_model=Ticket)
@@ -107,11 +214,11 @@ async def close_ticket(
     db: AsyncIOMotorDatabase = Depends(get_database),  # noqa: B008
     user: dict = Depends(get_current_user),  # noqa: B008
 ):
-    result = await db["tickets"].update_one(
+    doc = await db["tickets"].find_one_and_update(
         {"id": str(ticket_id)},
-        {"$set": {"status": TicketStatus.closed.value}}
+        {"$set": {"status": TicketStatus.closed.value}},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if not doc:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    doc = await db["tickets"].find_one({"id": str(ticket_id)})
     return Ticket(**{**doc, "id": UUID(doc["id"])}) 
\ No newline at end of file
@@ -1,53 +1,79 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import CollectionInvalid
 import asyncio
+import sys
 from app.core.config import settings
+from app.core.crud import NORMALIZED_SUFFIX, SEARCH_FIELDS
+from app.core.database import create_client
+from app.core.indexes import ensure_indexes, find_collection_scans
 
 
-async def init_collections():
-    client = AsyncIOMotorClient(settings.mongodb_url)
+async def init_collections(explain: bool = False):
+    client = create_client()
     db = client[settings.database_name]
 
     # Create users collection with schema validation
-    await db.create_collection("user", 
-        validator={
-            "$jsonSchema": {
-                "bsonType": "object",
-                "required": ["username", "email", "hashed_password", "created_at"],
-                "properties": {
-                    "username": {
-                        "bsonType": "string",
-                        "description": "must be a string and is required"
+    try:
+        await db.create_collection("users",
+            validator={
+                "$jsonSchema": {
+                    "bsonType": "object",
+                    "required": ["username", "email", "hashed_password", "created_at"],
+                    "properties": {
+                        "_id": {
+                            "bsonType": "objectId"
+                        },
+                        "username": {
+                            "bsonType": "string",
+                            "description": "must be a string and is required"
+                        },
+                        "email": {
+                            "bsonType": "string",
+                            "pattern": "^.+@.+$",
+                            "description": "must be a valid email address"
+                        },
+                        "hashed_password": {
+                            "bsonType": "string",
+                            "description": "must be a string and is required"
+                        },
+                        "created_at": {
+                            "bsonType": "date",
+                            "description": "must be a date and is required"
+                        },
+                        "last_login": {
+                            "bsonType": ["date", "null"],
+                            "description": "must be a date or null"
+                        }
                     },
-                    "email": {
-                        "bsonType": "string",
-                        "pattern": "^.+@.+$",
-                        "description": "must be a valid email address"
-                    },
-                    "hashed_password": {
-                        "bsonType": "string",
-                        "description": "must be a string and is required"
-                    },
-                    "created_at": {
-                        "bsonType": "date",
-                        "description": "must be a date and is required"
-                    },
-                    "last_login": {
-                        "bsonType": ["date", "null"],
-                        "description": "must be a date or null"
-                    }
-                },
-                "additionalProperties": False  # Prevents additional fields
+                    "additionalProperties": False  # Prevents additional fields
+                }
             }
-        }
-    )
+        )
+    except CollectionInvalid:
+        print("users collection already exists, skipping creation")
+
+    # Backfill the lowercase fields used by prefix search
+    for collection_name in ("brand", "merchant"):
+        await db[collection_name].update_many({}, [{
+            "$set": {
+                f"{field}{NORMALIZED_SUFFIX}": {"$toLower": f"${field}"}
+                for field in SEARCH_FIELDS
+            }
+        }])
+
+    # Create indexes from the manifest
+    applied = await ensure_indexes(db)
+    for collection_name, names in applied.items():
+        print(f"{collection_name}: {', '.join(names)}")
 
-    # Create indexes
-    await db.users.create_index("username", unique=True)
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("created_at")
+    if explain:
+        scans = await find_collection_scans(db)
+        for scan in scans:
+            print(f"COLLSCAN on {scan['collection']}: {scan['query']} {scan.get('error', '')}")
+        if not scans:
+            print("No probe query falls back to a collection scan")
 
     print("Collections initialized successfully")
     client.close()
 
 if __name__ == "__main__":
-    asyncio.run(init_collections()) 
\ No newline at end of file
+    asyncio.run(init_collections(explain="--explain" in sys.argv))
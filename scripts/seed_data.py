@@ -0,0 +1,192 @@
+"""Fill brand, merchant and tickets with synthetic data at production scale.
+
+Usage:
+    python -m scripts.seed_data [--brands 1000000] [--merchants 200000] [--tickets 500000]
+                                [--seed 42] [--batch-size 5000] [--concurrency 8]
+                                [--drop [--force]] [--indexes] [--database NAME]
+
+Every batch draws from its own RNG seeded with (seed, collection, batch), so
+the same seed produces the same documents however the inserts interleave.
+Batches are inserted unordered, with up to ``--concurrency`` in flight.
+``--drop`` refuses to wipe the configured application database
+(``settings.database_name``) unless ``--force`` is given.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import string
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from app.core.config import settings
+from app.core.crud import normalize_search_fields
+from app.core.database import create_client
+from app.core.indexes import ensure_indexes
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+MANUFACTURERS = [
+    "Allergan", "Galderma", "Merz Aesthetics", "Teoxane", "Sinclair", "Croma",
+    "Revance", "Prollenium", "Suneva", "Bloomage", "LG Chem", "Hugel",
+    "IBSA", "Fidia", "Vivacy", "Anteis", "Dr. Korman", "Caregen",
+]
+CATEGORIES = ["Hyaluronic acid", "Calcium hydroxylapatite", "Poly-L-lactic acid", "PMMA", "Polycaprolactone"]
+COUNTRIES = ["France", "Switzerland", "Germany", "United States", "South Korea", "China", "Italy", "Sweden"]
+CITIES = [
+    ("Paris", "France"), ("Lyon", "France"), ("Marseille", "France"), ("Geneva", "Switzerland"),
+    ("Berlin", "Germany"), ("Munich", "Germany"), ("New York", "United States"),
+    ("Los Angeles", "United States"), ("Seoul", "South Korea"), ("Shanghai", "China"),
+    ("Milan", "Italy"), ("Stockholm", "Sweden"),
+]
+SYLLABLES = ["vo", "lu", "ma", "ren", "tis", "ju", "vé", "derm", "ly", "sa", "no", "ra", "fil", "xa", "bel", "qui"]
+WORDS = (
+    "filler volume lift contour lips cheeks chin wrinkles hydration gel "
+    "cross-linked duration months injection cannula lidocaine smooth natural "
+    "elasticity density treatment clinic certified practitioner results"
+).split()
+TICKET_TITLES = ["Incident", "Order issue", "Delivery delay", "Invoice", "Product question", "Adverse event report"]
+# Weights roughly matching a live ticket queue
+TICKET_STATUSES = (["open", "stalled", "closed"], [0.25, 0.1, 0.65])
+
+
+def _zipf_weights(count: int, skew: float = 1.1) -> List[float]:
+    """Cumulative long-tailed popularity weights, like real catalogs."""
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+ZIPF_WEIGHTS = {len(values): _zipf_weights(len(values)) for values in (MANUFACTURERS, CATEGORIES)}
+
+def _zipf_choice(rng: random.Random, values: List[str]) -> str:
+    return rng.choices(values, cum_weights=ZIPF_WEIGHTS[len(values)])[0]
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def _created_at(rng: random.Random) -> datetime:
+    # Whole milliseconds, the precision BSON dates keep
+    return EPOCH + timedelta(milliseconds=rng.randrange(SPAN_SECONDS * 1000))
+
+def _product_name(rng: random.Random, index: int) -> str:
+    stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    return f"{stem} {rng.choice(['Volume', 'Lips', 'Ultra', 'Deep', 'Fine Lines', 'Skinbooster'])} {index}"
+
+
+def generate_brand(rng: random.Random, index: int) -> Dict[str, Any]:
+    manufacturer = _zipf_choice(rng, MANUFACTURERS)
+    return normalize_search_fields({
+        "name": _product_name(rng, index),
+        "manufacturer": manufacturer,
+        "country": rng.choice(COUNTRIES),
+        "category": _zipf_choice(rng, CATEGORIES),
+        "description": _sentence(rng, rng.randint(20, 80)),
+        "website": f"https://www.{manufacturer.lower().replace(' ', '').replace('.', '')}.example",
+        "created_at": _created_at(rng),
+    })
+
+def generate_merchant(rng: random.Random, index: int) -> Dict[str, Any]:
+    city, country = rng.choice(CITIES)
+    name = f"{rng.choice(['Clinique', 'Aesthetic Center', 'Skin Studio', 'Dermatology'])} {city} {index}"
+    return normalize_search_fields({
+        "name": name,
+        "manufacturer": _zipf_choice(rng, MANUFACTURERS),
+        "city": city,
+        "country": country,
+        "address": f"{rng.randint(1, 250)} {rng.choice(['Rue', 'Avenue', 'Street', 'Road'])} {rng.choice(string.ascii_uppercase)}",
+        "phone": "+" + "".join(rng.choice(string.digits) for _ in range(11)),
+        "website": f"https://merchant{index}.example",
+        "description": _sentence(rng, rng.randint(10, 40)),
+        "created_at": _created_at(rng),
+    })
+
+def generate_ticket(rng: random.Random, index: int) -> Dict[str, Any]:
+    statuses, weights = TICKET_STATUSES
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "title": f"{rng.choice(TICKET_TITLES)} #{index}",
+        "description": _sentence(rng, rng.randint(8, 30)),
+        "status": rng.choices(statuses, weights)[0],
+        "created_at": _created_at(rng),
+    }
+
+GENERATORS: Dict[str, Callable[[random.Random, int], Dict[str, Any]]] = {
+    "brand": generate_brand,
+    "merchant": generate_merchant,
+    "tickets": generate_ticket,
+}
+
+
+def generate_batch(collection: str, seed: int, batch: int, batch_size: int, total: int) -> List[Dict[str, Any]]:
+    """Documents ``batch * batch_size`` up to ``total`` (exclusive) of ``collection``."""
+    rng = random.Random(f"{seed}:{collection}:{batch}")
+    start = batch * batch_size
+    return [GENERATORS[collection](rng, index) for index in range(start, min(start + batch_size, total))]
+
+
+async def seed_collection(db, collection: str, total: int, seed: int, batch_size: int, concurrency: int) -> float:
+    """Insert ``total`` generated documents and return the elapsed seconds."""
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    inserted = 0
+
+    async def insert(documents: List[Dict[str, Any]]) -> None:
+        nonlocal inserted
+        try:
+            await db[collection].insert_many(documents, ordered=False)
+            inserted += len(documents)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    for batch in range((total + batch_size - 1) // batch_size):
+        # Generate the next batch while up to `concurrency` inserts are in flight
+        await semaphore.acquire()
+        documents = generate_batch(collection, seed, batch, batch_size, total)
+        tasks.append(asyncio.create_task(insert(documents)))
+    await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - started
+    print(f"{collection}: {inserted} documents in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):,.0f}/s)")
+    return elapsed
+
+
+async def seed_data(args: argparse.Namespace) -> None:
+    client = create_client()
+    db = client[args.database or settings.database_name]
+    totals = {"brand": args.brands, "merchant": args.merchants, "tickets": args.tickets}
+
+    for collection, total in totals.items():
+        if args.drop:
+            await db.drop_collection(collection)
+        if total:
+            await seed_collection(db, collection, total, args.seed, args.batch_size, args.concurrency)
+
+    if args.indexes:
+        await ensure_indexes(db)
+        print("Indexes are up to date")
+    client.close()
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--brands", type=int, default=100_000)
+    parser.add_argument("--merchants", type=int, default=20_000)
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8, help="Bulk inserts in flight")
+    parser.add_argument("--drop", action="store_true", help="Drop the collections first")
+    parser.add_argument("--force", action="store_true", help="Allow --drop on settings.database_name")
+    parser.add_argument("--indexes", action="store_true", help="Apply the index manifest afterwards")
+    parser.add_argument("--database", help="Database name (defaults to settings.database_name)")
+    args = parser.parse_args(argv)
+    if args.drop and not args.force and (args.database or settings.database_name) == settings.database_name:
+        parser.error(
+            f"--drop would wipe the application database {settings.database_name!r}; "
+            "pass --database to seed another one, or --force"
+        )
+    return args
+
+if __name__ == "__main__":
+    asyncio.run(seed_data(parse_args()))
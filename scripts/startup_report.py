@@ -0,0 +1,99 @@
+"""Report worker startup cost: app.main import time and lifespan duration.
+
+Usage:
+    python -m scripts.startup_report [--max-import-ms 1500] [--max-startup-ms 5000] [--top 15]
+
+Exits with status 1 when a budget is exceeded or an export-only dependency
+(openpyxl, pyarrow) is imported at startup, so it can guard
+against regressions in CI.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+# Only needed by the export path; importing them at startup is a regression
+LAZY_MODULES = ("openpyxl", "pyarrow")
+
+IMPORT_PROBE = (
+    "import sys, time;"
+    "started = time.perf_counter();"
+    "import app.main;"
+    "print(time.perf_counter() - started);"
+    "print(','.join(sorted(set(m.split('.')[0] for m in sys.modules))))"
+)
+
+
+def measure_import(top: int):
+    """Import app.main in a fresh interpreter and return (ms, modules, slowest)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    seconds, modules = result.stdout.strip().splitlines()[-2:]
+
+    # -X importtime lines: "import time: self [us] | cumulative | imported package".
+    # Keep the largest cumulative time per top-level package, which is the
+    # cost of its first import.
+    packages = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        package = parts[2].strip().split(".")[0]
+        if package != "app":
+            packages[package] = max(packages.get(package, 0), int(parts[1]))
+    slowest = sorted(((us, name) for name, us in packages.items()), reverse=True)
+
+    return float(seconds) * 1000, set(modules.split(",")), slowest[:top]
+
+
+async def measure_lifespan() -> float:
+    """Run the application lifespan startup and shutdown, returning startup ms."""
+    from app.main import app
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        elapsed = time.perf_counter() - started
+    return elapsed * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-startup-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=15, help="Slowest packages to list")
+    parser.add_argument("--skip-lifespan", action="store_true", help="Only measure the import")
+    args = parser.parse_args()
+
+    failures = []
+
+    import_ms, modules, slowest = measure_import(args.top)
+    print(f"app.main import: {import_ms:.1f} ms")
+    for cumulative_us, name in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"export dependencies imported at startup: {', '.join(eager)}")
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        failures.append(f"import took {import_ms:.1f} ms (budget {args.max_import_ms:.1f} ms)")
+
+    if not args.skip_lifespan:
+        startup_ms = asyncio.run(measure_lifespan())
+        print(f"lifespan startup: {startup_ms:.1f} ms")
+        if args.max_startup_ms is not None and startup_ms > args.max_startup_ms:
+            failures.append(f"lifespan startup took {startup_ms:.1f} ms (budget {args.max_startup_ms:.1f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
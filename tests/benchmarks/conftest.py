@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from tests.benchmarks.harness import BASELINES_PATH, RUNNER, save_baselines
+
+# Results of the benchmarks run in this session, reported at the end
+results = []
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    return results
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run the load benchmarks")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
+
+def pytest_terminal_summary(terminalreporter):
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    header = f"{'scenario':<24}{'conc':>6}{'reqs':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    terminalreporter.write_line(header)
+    for result in results:
+        s = result.summary()
+        terminalreporter.write_line(
+            f"{result.scenario:<24}{s['concurrency']:>6}{s['requests']:>6}{s['errors']:>8}"
+            f"{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['rps']:>10}"
+        )
+    if os.getenv("BENCH_UPDATE_BASELINES"):
+        save_baselines(BASELINES_PATH, results)
+        terminalreporter.write_line(f"Baselines written to {BASELINES_PATH}")
+    elif not BASELINES_PATH.exists():
+        terminalreporter.write_line(
+            f"No baselines for runner {RUNNER!r}, so regressions were not checked. "
+            "Record them with `make bench-baselines` (set BENCH_RUNNER to share them across hosts)."
+        )
@@ -0,0 +1,132 @@
+"""Fixed-concurrency load runner and baseline comparison for the benchmarks.
+
+Absolute latencies only compare on the machine that measured them, so
+baselines are kept per runner: ``baselines/<runner>.json``, where the runner
+is ``BENCH_RUNNER`` (e.g. ``ci`` on the CI workers) or the host name.
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BASELINES_DIR = Path(os.getenv("BENCH_BASELINES_DIR", Path(__file__).parent / "baselines"))
+RUNNER = os.getenv("BENCH_RUNNER") or platform.node() or "local"
+BASELINES_PATH = BASELINES_DIR / f"{RUNNER}.json"
+
+SendRequest = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    concurrency: int
+    requests: int
+    wall_seconds: float
+    latencies_ms: List[float] = field(repr=False)
+    errors: int = 0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the request latencies, in milliseconds."""
+        ordered = sorted(self.latencies_ms)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "rps": round(self.rps, 1),
+        }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenario: str,
+    send: SendRequest,
+    concurrency: int,
+    requests: int,
+    warmup: int = 0,
+) -> BenchmarkResult:
+    """Send ``requests`` requests through ``concurrency`` workers and time each one.
+
+    ``send`` gets the request index, so scenarios can vary pages or payloads.
+    Responses with a 4xx/5xx status are counted as errors.
+    """
+    for i in range(warmup):
+        await send(client, i)
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await send(client, index)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return BenchmarkResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=requests,
+        wall_seconds=time.perf_counter() - started,
+        latencies_ms=latencies,
+        errors=errors,
+    )
+
+
+def load_baselines(path: Path) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+def save_baselines(path: Path, results: List[BenchmarkResult]) -> None:
+    baselines = load_baselines(path)
+    for result in results:
+        summary = result.summary()
+        baselines[result.scenario] = {"p95_ms": summary["p95_ms"], "rps": summary["rps"]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+def find_regressions(
+    result: BenchmarkResult,
+    baseline: Optional[Dict[str, float]],
+    tolerance: float,
+    slack_ms: float = 5.0,
+) -> List[str]:
+    """Describe how ``result`` is worse than ``baseline`` beyond ``tolerance``.
+
+    Latency must also be ``slack_ms`` over the baseline, so jitter on
+    millisecond-scale endpoints does not fail the build.
+    """
+    if not baseline:
+        return []
+    regressions = []
+    p95 = result.percentile(95)
+    if p95 > max(baseline["p95_ms"] * (1 + tolerance), baseline["p95_ms"] + slack_ms):
+        regressions.append(f"p95 {p95:.1f} ms > baseline {baseline['p95_ms']} ms")
+    if result.rps < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"{result.rps:.1f} req/s < baseline {baseline['rps']} req/s")
+    return regressions
@@ -0,0 +1,59 @@
+"""Locust load profile for a running server.
+
+Fill the server's database with catalog data and create the user the run
+logs in as, then start locust:
+
+    python -m scripts.seed_data --database <server database>
+    curl -X POST http://localhost:8000/auth/register -H "Content-Type: application/json" \
+        -d '{"username": "bench", "email": "bench@example.com", "password": "Bench-pass1!"}'
+    locust -f tests/benchmarks/locustfile.py --host http://localhost:8000
+
+Credentials come from ``BENCH_USERNAME`` / ``BENCH_PASSWORD`` (defaults above).
+"""
+import os
+import random
+
+from locust import HttpUser, between, task
+
+USERNAME = os.getenv("BENCH_USERNAME", "bench")
+PASSWORD = os.getenv("BENCH_PASSWORD", "Bench-pass1!")
+
+
+class ApiUser(HttpUser):
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        response = self.client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD})
+        response.raise_for_status()
+        self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        self.ticket_ids = []
+
+    @task(10)
+    def list_brands(self):
+        self.client.get("/brand/", params={"page": random.randint(1, 20), "page_size": 100}, name="/brand/")
+
+    @task(3)
+    def filter_brands(self):
+        self.client.get("/brand/", params={"name": random.choice("abcdefgh")}, name="/brand/?name")
+
+    @task(1)
+    def export_brands(self):
+        self.client.get("/brand/", params={"export_as": "csv"}, name="/brand/?export_as=csv")
+
+    @task(5)
+    def list_merchants(self):
+        self.client.get("/merchant/", params={"page": random.randint(1, 5)}, name="/merchant/")
+
+    @task(2)
+    def create_ticket(self):
+        response = self.client.post("/tickets/", json=[{"title": "Load test", "description": "locust"}])
+        if response.ok:
+            self.ticket_ids.append(response.json()[0]["id"])
+
+    @task(4)
+    def read_and_update_ticket(self):
+        if not self.ticket_ids:
+            return
+        ticket_id = random.choice(self.ticket_ids)
+        self.client.get(f"/tickets/{ticket_id}", name="/tickets/{id}")
+        self.client.put(f"/tickets/{ticket_id}", json={"status": "stalled"}, name="/tickets/{id}")
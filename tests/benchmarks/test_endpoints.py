@@ -0,0 +1,185 @@
+"""Load benchmarks for the hot endpoints.
+
+Runs the app in process over ``httpx.ASGITransport`` against a seeded
+MongoDB: a real server when ``BENCH_MONGODB_URL`` is set, otherwise
+mongomock-motor (``pip install -e .[bench]``). Each scenario sends a fixed
+number of requests at a fixed concurrency, reports p50/p95/p99 latency and
+requests per second, and fails when p95 or throughput is worse than the
+runner's baselines (see ``harness``) by more than ``BENCH_TOLERANCE``
+(default 0.5) and, for latency, ``BENCH_SLACK_MS`` (default 5). Without
+baselines for the runner, results are reported but not checked.
+
+Scenarios run with the response and count caches emptied before every
+request, so they measure the queries and serialization; ``brand_json_cached``
+measures cache hits on its own.
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks
+    RUN_BENCHMARKS=1 BENCH_UPDATE_BASELINES=1 pytest tests/benchmarks
+"""
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import httpx
+import pytest  # type: ignore
+
+from app.core.crud import count_cache, normalize_search_fields
+from app.core import database
+from app.core.response_cache import response_cache
+from app.core.security import get_password_hash
+from app.main import app
+from tests.benchmarks.harness import BASELINES_PATH, SendRequest, find_regressions, load_baselines, run_load
+
+USERNAME = "bench"
+PASSWORD = "Bench-pass1!"
+BRAND_COUNT = 2000
+MERCHANT_COUNT = 500
+TICKET_COUNT = 200
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.5"))
+SLACK_MS = float(os.getenv("BENCH_SLACK_MS", "5"))
+
+
+@dataclass
+class Scenario:
+    send: SendRequest
+    concurrency: int = 10
+    requests: int = 200
+    authenticated: bool = True
+    # Let repeated requests hit the response and count caches
+    cached: bool = False
+
+
+def _ticket_id(index: int) -> str:
+    return str(uuid.UUID(int=index % TICKET_COUNT + 1))
+
+SCENARIOS = {
+    # bcrypt dominates the login path, so keep this one small
+    "auth_token": Scenario(
+        lambda client, i: client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD}),
+        concurrency=4,
+        requests=20,
+        authenticated=False,
+    ),
+    "brand_json": Scenario(lambda client, i: client.get("/brand/", params={"page": i % 20 + 1, "page_size": 100})),
+    "brand_json_cached": Scenario(
+        lambda client, i: client.get("/brand/", params={"page": i % 20 + 1, "page_size": 100}), cached=True
+    ),
+    "brand_json_filtered": Scenario(lambda client, i: client.get("/brand/", params={"name": f"brand {i % 50}"})),
+    "brand_export_csv": Scenario(
+        lambda client, i: client.get("/brand/", params={"export_as": "csv"}), concurrency=4, requests=20
+    ),
+    "merchant_json": Scenario(lambda client, i: client.get("/merchant/", params={"page": i % 5 + 1})),
+    "tickets_create": Scenario(
+        lambda client, i: client.post("/tickets/", json=[{"title": f"Load {i}", "description": "Benchmark"}])
+    ),
+    "tickets_list": Scenario(lambda client, i: client.get("/tickets/", params={"status": "open"})),
+    "tickets_get": Scenario(lambda client, i: client.get(f"/tickets/{_ticket_id(i)}")),
+    "tickets_update": Scenario(
+        lambda client, i: client.put(f"/tickets/{_ticket_id(i)}", json={"description": f"Updated {i}"})
+    ),
+}
+
+
+async def _seed(db) -> None:
+    now = datetime.now(timezone.utc)
+    await db.users.insert_one({
+        "username": USERNAME,
+        "email": "bench@example.com",
+        "hashed_password": get_password_hash(PASSWORD),
+        "created_at": now,
+    })
+    await db.brand.insert_many([
+        normalize_search_fields({
+            "name": f"Brand {i}",
+            "manufacturer": f"Lab {i % 40}",
+            "country": "France",
+            "description": "Hyaluronic acid filler " * 10,
+            "created_at": now,
+        })
+        for i in range(BRAND_COUNT)
+    ])
+    await db.merchant.insert_many([
+        normalize_search_fields({"name": f"Clinic {i}", "city": "Paris", "country": "France", "created_at": now})
+        for i in range(MERCHANT_COUNT)
+    ])
+    await db.tickets.insert_many([
+        {
+            "id": str(uuid.UUID(int=i + 1)),
+            "title": f"Ticket {i}",
+            "description": "Seeded",
+            "status": "open",
+            "created_at": now,
+        }
+        for i in range(TICKET_COUNT)
+    ])
+
+@asynccontextmanager
+async def bench_database():
+    database_name = f"bench_{uuid.uuid4().hex[:8]}"
+    mongodb_url = os.getenv("BENCH_MONGODB_URL")
+    if mongodb_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongodb_url)
+    else:
+        mongomock_motor = pytest.importorskip("mongomock_motor")
+        client = mongomock_motor.AsyncMongoMockClient()
+    db = client[database_name]
+    try:
+        await _seed(db)
+        yield db
+    finally:
+        await client.drop_database(database_name)
+        client.close()
+
+def _clear_caches() -> None:
+    response_cache.local.clear()
+    count_cache.clear()
+
+def _uncached(send: SendRequest) -> SendRequest:
+    def send_uncached(client, i):
+        _clear_caches()
+        return send(client, i)
+    return send_uncached
+
+@asynccontextmanager
+async def bench_client(db):
+    # Point the real dependencies at the bench database. dependency_overrides
+    # would make FastAPI rebuild every sub-dependency on each request, a cost
+    # production never pays. The shared (Redis) cache tier is left out so a
+    # configured Redis cannot serve results across runs.
+    saved = database.db.database, database.db.read_databases, response_cache.shared
+    database.db.database, database.db.read_databases, response_cache.shared = db, {}, None
+    _clear_caches()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+    finally:
+        database.db.database, database.db.read_databases, response_cache.shared = saved
+
+async def _run(name: str, scenario: Scenario):
+    async with bench_database() as db, bench_client(db) as client:
+        if scenario.authenticated:
+            response = await client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD})
+            client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        return await run_load(
+            client,
+            name,
+            scenario.send if scenario.cached else _uncached(scenario.send),
+            concurrency=scenario.concurrency,
+            requests=scenario.requests,
+            warmup=min(5, scenario.requests),
+        )
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_endpoint_benchmark(name, benchmark_results):
+    result = asyncio.run(_run(name, SCENARIOS[name]))
+    benchmark_results.append(result)
+
+    assert result.errors == 0, f"{result.errors} failed requests"
+    if not os.getenv("BENCH_UPDATE_BASELINES"):
+        regressions = find_regressions(result, load_baselines(BASELINES_PATH).get(name), TOLERANCE, SLACK_MS)
+        assert not regressions, f"{name} regressed: {'; '.join(regressions)}"
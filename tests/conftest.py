@@ -42,4 +42,81 @@ async def mongodb(mongodb_client):
 async def override_get_db(mongodb):
     async def _override_get_db():
         return mongodb
-    return _override_get_db 
\ No newline at end of file
+    return _override_get_db 
+
+def _project(doc, projection):
+    """Apply an inclusion or exclusion projection the way Mongo does."""
+    if not projection:
+        return dict(doc)
+    included = {k for k, v in projection.items() if v and k != "_id"}
+    if included:
+        projected = {k: v for k, v in doc.items() if k in included or k == "_id"}
+    else:
+        projected = {k: v for k, v in doc.items() if k not in projection}
+    if projection.get("_id", 1) == 0:
+        projected.pop("_id", None)
+    return projected
+
+class MockCursor:
+    def __init__(self, docs):
+        self.docs = docs
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+    def batch_size(self, n):
+        return self
+    async def to_list(self, length=None):
+        return list(self.docs)
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+class MockCollection:
+    """In-memory stand-in for the catalog collections.
+
+    Filters are ignored except for the ``_id`` seek used by cursor pagination.
+    """
+    def __init__(self):
+        self.docs = []
+        self.find_calls = 0
+        self.count_calls = 0
+    async def count_documents(self, query):
+        self.count_calls += 1
+        return len(self.docs)
+    async def estimated_document_count(self):
+        return len(self.docs)
+    def find(self, query, projection=None):
+        self.find_calls += 1
+        docs = self.docs
+        for clause in query.get("$and", [query]):
+            if "_id" in clause:
+                docs = [d for d in docs if d["_id"] > clause["_id"]["$gt"]]
+        return MockCursor([_project(doc, projection) for doc in docs])
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if doc["_id"] == query["_id"]:
+                return _project(doc, projection)
+        return None
+    def aggregate(self, pipeline):
+        # Only the key listing of MongoManager.extra_field_names is supported
+        shapes = dict.fromkeys(tuple(doc) for doc in self.docs)
+        return MockCursor([{"_id": list(shape)} for shape in shapes])
+
+class MockDB(dict):
+    def __getitem__(self, item):
+        if item not in self:
+            self[item] = MockCollection()
+        return dict.__getitem__(self, item)
+
+@pytest.fixture
+def mock_mongo():
+    """An empty in-memory database; collections are created on first access."""
+    return MockDB()
@@ -0,0 +1,79 @@
+import pytest  # type: ignore
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+        def __call__(self):
+            return self.now
+    fake = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+def test_get_and_set(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    assert cache.get("alice") is None
+    cache.set("alice", 1)
+    assert cache.get("alice") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_entries_expire(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("alice", 1)
+    clock.now += 11
+    assert cache.get("alice") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("alice", 1)
+    cache.set("bob", 2)
+    cache.get("alice")
+    cache.set("carol", 3)
+    assert cache.get("bob") is None
+    assert cache.get("alice") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_invalidate(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("alice", 1)
+    cache.invalidate("alice")
+    cache.invalidate("unknown")
+    assert cache.get("alice") is None
+
+def test_zero_ttl_disables_cache(clock):
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set("alice", 1)
+    assert cache.get("alice") is None
+
+def test_per_entry_ttl_only_shortens(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("short", 1, ttl=2)
+    cache.set("long", 2, ttl=100)
+    cache.set("expired", 3, ttl=-1)
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("expired") is None
+
+@pytest.mark.asyncio
+async def test_shared_response_tier_works_without_the_local_tier():
+    from app.core.response_cache import ResponseCache
+
+    class SharedTier:
+        def __init__(self):
+            self.bodies = {}
+        async def get(self, key):
+            return self.bodies.get(key)
+        async def set(self, key, body):
+            self.bodies[key] = body
+
+    cache = ResponseCache(local=TTLCache(maxsize=16, ttl=0), shared=SharedTier())
+    key = cache.make_key("brand", page=1)
+    etag = await cache.set(key, b"[]")
+    assert await cache.get(key) == (b"[]", etag)
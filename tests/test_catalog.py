@@ -0,0 +1,131 @@
+from bson import ObjectId
+
+import pytest  # type: ignore
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user
+from app.core.database import get_catalog_database
+from app.core.models.user import UserInDB
+from app.core.response_cache import response_cache
+from app.main import app
+
+
+@pytest.fixture
+def mock_db(mock_mongo):
+    mock_mongo["brand"].docs = [{"_id": ObjectId(), "name": f"Brand {i}", "manufacturer": "Lab"} for i in range(3)]
+    mock_mongo["merchant"].docs = [{"_id": ObjectId(), "name": "Clinic", "city": "Paris"}]
+    return mock_mongo
+
+@pytest.fixture
+def client(mock_db):
+    async def override_db():
+        return mock_db
+    async def override_user():
+        return UserInDB(username="testuser", email="test@example.com", hashed_password="x")
+    app.dependency_overrides[get_catalog_database] = override_db
+    app.dependency_overrides[get_current_user] = override_user
+    response_cache.local.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_list_brands(client):
+    response = client.get("/brand/", params={"page_size": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [b["name"] for b in data["data"]] == ["Brand 0", "Brand 1"]
+    assert data["pagination"] == {"total": 3, "page": 1, "page_size": 2, "pages": 2}
+    assert data["next_cursor"]
+
+def test_list_merchants_without_total(client):
+    response = client.get("/merchant/", params={"include_total": "false"})
+    assert response.status_code == 200
+    assert response.json()["pagination"]["total"] is None
+
+def test_cached_page_is_revalidated_with_etag(client, mock_db):
+    first = client.get("/brand/")
+    etag = first.headers["etag"]
+
+    second = client.get("/brand/")
+    assert second.content == first.content
+    assert mock_db["brand"].find_calls == 1
+
+    not_modified = client.get("/brand/", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+def test_sparse_fieldset(client):
+    response = client.get("/brand/", params={"fields": "name"})
+    assert response.status_code == 200
+    assert response.json()["data"][0] == {"name": "Brand 0"}
+
+    response = client.get("/brand/", params={"fields": "name,hashed_password"})
+    assert response.status_code == 400
+
+def test_csv_export(client):
+    response = client.get("/brand/", params={"export_as": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "name,manufacturer,country,category,description,website,created_at"
+    assert lines[1] == "Brand 0,Lab,,,,,"
+
+def test_csv_export_keeps_extra_fields(client, mock_db):
+    mock_db["brand"].docs[0].update(extra_field="kept", name_lower="brand 0")
+    lines = client.get("/brand/", params={"export_as": "csv"}).text.splitlines()
+    assert lines[0] == "name,manufacturer,country,category,description,website,created_at,extra_field"
+    assert lines[1] == "Brand 0,Lab,,,,,,kept"
+    assert lines[2] == "Brand 1,Lab,,,,,,"
+
+def test_export_rejects_unknown_fields(client):
+    response = client.get("/brand/", params={"export_as": "csv", "fields": "name,bogus"})
+    assert response.status_code == 400
+
+def test_get_brand_by_id(client, mock_db):
+    brand_id = str(mock_db["brand"].docs[1]["_id"])
+    response = client.get(f"/brand/{brand_id}")
+    assert response.status_code == 200
+    assert response.json()["data"] == {"id": brand_id, "name": "Brand 1", "manufacturer": "Lab"}
+
+def test_get_brand_by_id_keeps_extra_fields(client, mock_db):
+    mock_db["brand"].docs[1].update(extra_field="kept", name_lower="brand 1")
+    brand_id = str(mock_db["brand"].docs[1]["_id"])
+    data = client.get(f"/brand/{brand_id}").json()["data"]
+    assert data["extra_field"] == "kept"
+    assert "name_lower" not in data
+    assert client.get("/brand/").json()["data"][1]["extra_field"] == "kept"
+
+def test_get_unknown_merchant_returns_404(client):
+    assert client.get(f"/merchant/{ObjectId()}").status_code == 404
+    assert client.get("/merchant/not-an-object-id").status_code == 404
+
+def test_fast_rendering_matches_pydantic_rendering(monkeypatch):
+    import json
+    from datetime import datetime
+
+    from app.core import responses
+    from app.core.models.response import BrandResponseModel
+
+    fields = {
+        "data": [{"name": "Brand", "created_at": datetime(2025, 1, 2, 3, 4, 5)}],
+        "pagination": {"total": 1, "page": 1, "page_size": 100, "pages": 1},
+    }
+    fast = responses.render_model(BrandResponseModel, **fields)
+    monkeypatch.setattr(responses.settings, "fast_json_responses", False)
+    validated = responses.render_model(BrandResponseModel, **fields)
+    assert json.loads(fast) == json.loads(validated)
+
+def test_dumps_handles_bson_types():
+    import json
+
+    from app.core.responses import dumps
+
+    oid = ObjectId()
+    assert json.loads(dumps({"_id": oid})) == {"_id": str(oid)}
+
+def test_records_are_derived_from_the_models():
+    from app.core.models.catalog import Brand, BrandRecord, Merchant, MerchantRecord
+
+    for model, record in ((Brand, BrandRecord), (Merchant, MerchantRecord)):
+        assert record.field_names() == tuple(name for name in model.model_fields if name != "id")
+        # Projections may omit any field, required ones included
+        assert record().to_dict() == {}
@@ -0,0 +1,90 @@
+import gzip
+
+import pytest  # type: ignore
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    CompressionMiddleware,
+    compression_stats,
+    is_compressible,
+    negotiate_encoding,
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, min_size=100, offload_size=1000, encodings=["gzip"])
+
+    @app.get("/text/{size}")
+    async def text(size: int):
+        return PlainTextResponse("a" * size)
+
+    @app.get("/tagged")
+    async def tagged():
+        return PlainTextResponse("a" * 500, headers={"ETag": '"abc"'})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n".encode() * 50
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    @app.get("/binary")
+    async def binary():
+        return PlainTextResponse(b"\x00" * 500, media_type="application/octet-stream")
+
+    compression_stats.clear()
+    return TestClient(app)
+
+def test_negotiate_encoding():
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate_encoding("br;q=0, *", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding(None, supported) is None
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("text/csv; charset=utf-8")
+    assert not is_compressible("application/vnd.apache.parquet")
+
+def test_large_body_is_compressed(client):
+    # Larger than offload_size, so compressed on a worker thread
+    response = client.get("/text/5000", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < 5000
+    assert response.text == "a" * 5000
+
+    stats = compression_stats.stats()
+    assert stats[0]["route"] == "/text/{size}"
+    assert stats[0]["responses"] == 1
+    assert stats[0]["ratio"] > 1
+
+def test_small_body_is_not_compressed(client):
+    response = client.get("/text/50", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "a" * 50
+
+def test_incompressible_type_is_not_compressed(client):
+    response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+def test_streaming_body_is_compressed(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"".join(f"line {i}\n".encode() * 50 for i in range(3))
+
+def test_compressed_response_has_a_weak_etag(client):
+    response = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+
+    assert client.get("/tagged", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
@@ -0,0 +1,77 @@
+from bson import ObjectId
+
+import pytest  # type: ignore
+
+from app.core.crud import MongoManager, count_cache, decode_cursor, encode_cursor, normalize_search_fields
+from app.core.enums import SearchMode
+from app.core.exceptions import ValidationException
+
+
+@pytest.fixture
+def mock_db(mock_mongo):
+    mock_mongo["brand"].docs = [{"_id": ObjectId(), "name": f"Brand {i}"} for i in range(5)]
+    return mock_mongo
+
+def test_cursor_round_trip():
+    oid = ObjectId()
+    assert decode_cursor(encode_cursor(oid)) == oid
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValidationException):
+        decode_cursor("not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_get_page_follows_cursor(mock_db):
+    crud = MongoManager("brand")
+    first, next_cursor = await crud.get_page(mock_db, limit=2)
+    assert [d["name"] for d in first] == ["Brand 0", "Brand 1"]
+    assert "_id" not in first[0]
+
+    second, next_cursor = await crud.get_page(mock_db, limit=2, after=next_cursor)
+    assert [d["name"] for d in second] == ["Brand 2", "Brand 3"]
+
+    last, next_cursor = await crud.get_page(mock_db, limit=2, after=next_cursor)
+    assert [d["name"] for d in last] == ["Brand 4"]
+    assert next_cursor is None
+
+@pytest.mark.asyncio
+async def test_get_page_with_skip(mock_db):
+    crud = MongoManager("brand")
+    page, _ = await crud.get_page(mock_db, limit=2, skip=2)
+    assert [d["name"] for d in page] == ["Brand 2", "Brand 3"]
+
+@pytest.mark.asyncio
+async def test_filtered_count_is_cached(mock_db):
+    count_cache.clear()
+    crud = MongoManager("brand")
+    assert await crud.count(mock_db, "brand") == 5
+    assert await crud.count(mock_db, "brand") == 5
+    assert mock_db["brand"].count_calls == 1
+    assert await crud.count(mock_db, "brand", exact=True) == 5
+    assert mock_db["brand"].count_calls == 2
+
+@pytest.mark.asyncio
+async def test_unfiltered_count_uses_estimate(mock_db):
+    crud = MongoManager("brand")
+    assert await crud.count(mock_db) == 5
+    assert mock_db["brand"].count_calls == 0
+
+def test_regex_search_escapes_input():
+    query = MongoManager("brand")._build_query("a.b(", SearchMode.REGEX)
+    assert query["$or"][0] == {"name": {"$regex": r"a\.b\(", "$options": "i"}}
+
+def test_prefix_search_uses_normalized_fields():
+    query = MongoManager("brand")._build_query("Juve", SearchMode.PREFIX)
+    assert query["$or"][0] == {"name_lower": {"$regex": "^juve"}}
+    assert normalize_search_fields({"name": "Juvederm"})["name_lower"] == "juvederm"
+
+def test_text_search():
+    query = MongoManager("brand")._build_query("juvederm", SearchMode.TEXT)
+    assert query == {"$text": {"$search": "juvederm"}}
+
+def test_plan_stages_finds_nested_collection_scan():
+    from app.core.indexes import _plan_stages
+
+    plan = {"stage": "SORT", "inputStage": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}}
+    assert "COLLSCAN" in _plan_stages(plan)
+    assert "COLLSCAN" not in _plan_stages({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}})
@@ -0,0 +1,24 @@
+import pytest  # type: ignore
+
+from app.core import database
+from app.core.database import connect_to_mongo, close_mongo_connection, get_catalog_database, get_database
+
+
+@pytest.mark.asyncio
+async def test_catalog_reads_use_their_own_read_preference(monkeypatch):
+    monkeypatch.setattr(database.settings, "catalog_read_preference", "secondaryPreferred")
+    monkeypatch.setattr(database.settings, "catalog_max_staleness_seconds", 120)
+    monkeypatch.setattr(database.settings, "catalog_read_concern", "local")
+    monkeypatch.setattr(database.settings, "mongo_max_pool_size", 10)
+
+    await connect_to_mongo()
+    try:
+        catalog = await get_catalog_database()
+        primary = await get_database()
+        assert catalog.read_preference.mongos_mode == "secondaryPreferred"
+        assert catalog.read_preference.max_staleness == 120
+        assert catalog.read_concern.level == "local"
+        assert primary.read_preference.mongos_mode == "primary"
+        assert database.db.client.options.pool_options.max_pool_size == 10
+    finally:
+        await close_mongo_connection()
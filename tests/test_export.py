@@ -0,0 +1,102 @@
+import io
+import json
+from datetime import datetime
+
+import pytest  # type: ignore
+
+from app.core.enums import ExportFormat
+from app.core.export import get_exporter, stream_csv
+
+
+async def iterate(documents):
+    for document in documents:
+        yield document
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_one_chunk_per_batch():
+    documents = [{"name": f"Brand {i}", "country": "FR"} for i in range(5)]
+    chunks = await collect(stream_csv(iterate(documents), ["name", "country"], batch_size=2))
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0] == "name,country"
+    assert lines[1:] == [f"Brand {i},FR" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_stream_csv_header_is_the_declared_fields():
+    # "city" first shows up after the first batch and is still exported
+    documents = [{"name": "A"}, {"name": "B", "country": "FR"}, {"name": "C", "city": "Paris", "extra": 1}]
+    chunks = await collect(stream_csv(iterate(documents), ["name", "country", "city"], batch_size=2))
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines == ["name,country,city", "A,,", "B,FR,", "C,,Paris"]
+
+@pytest.mark.asyncio
+async def test_stream_csv_empty():
+    assert await collect(stream_csv(iterate([]), ["name"])) == []
+
+@pytest.mark.asyncio
+async def test_registry_covers_every_export_format():
+    for export_format in ExportFormat:
+        if export_format != ExportFormat.JSON:
+            exporter = get_exporter(export_format, ["name"])
+            assert exporter.media_type
+            assert exporter.memory_profile in ("streaming", "row_group", "spooled")
+
+@pytest.mark.asyncio
+async def test_ndjson_exporter():
+    documents = [{"name": "A", "created_at": datetime(2025, 1, 1)}]
+    chunks = await collect(get_exporter(ExportFormat.NDJSON, ["name", "created_at"]).stream(iterate(documents)))
+    assert json.loads(b"".join(chunks)) == {"name": "A", "created_at": "2025-01-01T00:00:00"}
+
+@pytest.mark.asyncio
+async def test_xlsx_exporter():
+    from openpyxl import load_workbook
+
+    documents = [{"name": f"Brand {i}", "tags": ["a"]} for i in range(3)]
+    exporter = get_exporter(ExportFormat.EXCEL, ["name", "tags"], batch_size=2)
+    chunks = await collect(exporter.stream(iterate(documents)))
+    sheet = load_workbook(io.BytesIO(b"".join(chunks))).active
+    rows = list(sheet.values)
+    assert rows[0] == ("name", "tags")
+    assert rows[3] == ("Brand 2", '["a"]')
+
+@pytest.mark.asyncio
+async def test_parquet_exporter_writes_one_row_group_per_batch():
+    import pyarrow.parquet as pq
+
+    documents = [{"name": f"Brand {i}", "country": None if i < 2 else "FR"} for i in range(5)]
+    exporter = get_exporter(ExportFormat.PARQUET, ["name", "country"], batch_size=2)
+    chunks = await collect(exporter.stream(iterate(documents)))
+    parquet_file = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet_file.num_row_groups == 3
+    assert parquet_file.read().column("country").to_pylist() == [None, None, "FR", "FR", "FR"]
+
+@pytest.mark.asyncio
+async def test_parquet_exporter_uses_declared_types():
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Null throughout the first batch, then an int and a datetime
+    documents = [{"name": "A"}, {"name": "B"}, {"name": 3, "score": 7, "created_at": datetime(2025, 1, 1)}]
+    exporter = get_exporter(
+        ExportFormat.PARQUET,
+        ["name", "score", "created_at"],
+        batch_size=2,
+        field_types={"name": str, "score": int, "created_at": datetime},
+    )
+    table = pq.read_table(io.BytesIO(b"".join(await collect(exporter.stream(iterate(documents))))))
+    assert table.schema.field("score").type == pa.int64()
+    assert table.column("name").to_pylist() == ["A", "B", "3"]
+    assert table.column("score").to_pylist() == [None, None, 7]
+    assert table.column("created_at").to_pylist() == [None, None, datetime(2025, 1, 1)]
+
+@pytest.mark.asyncio
+async def test_parquet_exporter_stringifies_undeclared_fields():
+    import pyarrow.parquet as pq
+
+    documents = [{"code": None}, {"code": None}, {"code": 42}]
+    exporter = get_exporter(ExportFormat.PARQUET, ["code"], batch_size=2)
+    table = pq.read_table(io.BytesIO(b"".join(await collect(exporter.stream(iterate(documents))))))
+    assert table.column("code").to_pylist() == [None, None, "42"]
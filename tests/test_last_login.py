@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+
+from app.core.auth import user_cache
+from app.core.last_login import LastLoginBuffer
+
+
+class MockUsers:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.writes = []
+    async def bulk_write(self, requests, ordered=True):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("down")
+        self.writes.append([(r._filter["username"], r._doc["$set"]["last_login"]) for r in requests])
+
+class MockDB:
+    def __init__(self, fail=False):
+        self.users = MockUsers(fail)
+
+def test_flush_coalesces_logins_per_user():
+    buffer = LastLoginBuffer(interval=60, max_pending=100)
+    db = MockDB()
+    buffer.record("alice", datetime(2025, 1, 1))
+    buffer.record("alice", datetime(2025, 1, 2))
+    buffer.record("bob", datetime(2025, 1, 3))
+    user_cache.set("alice", object())
+
+    assert asyncio.run(buffer.flush(db)) == 2
+    assert db.users.writes == [[("alice", datetime(2025, 1, 2)), ("bob", datetime(2025, 1, 3))]]
+    assert user_cache.get("alice") is None
+    assert asyncio.run(buffer.flush(db)) == 0
+
+def test_failed_flush_keeps_newer_logins():
+    buffer = LastLoginBuffer(interval=60, max_pending=100)
+    buffer.record("alice", datetime(2025, 1, 1))
+    buffer.record("bob", datetime(2025, 1, 1))
+
+    async def scenario():
+        flush = asyncio.create_task(buffer.flush(MockDB(fail=True)))
+        await asyncio.sleep(0)
+        # A login lands while the failing write is in flight
+        buffer.record("alice", datetime(2025, 1, 5))
+        return await flush
+
+    assert asyncio.run(scenario()) == 0
+    assert buffer.failed_flushes == 1
+
+    db = MockDB()
+    asyncio.run(buffer.flush(db))
+    assert sorted(db.users.writes[0]) == [("alice", datetime(2025, 1, 5)), ("bob", datetime(2025, 1, 1))]
+
+def test_run_flushes_early_when_full():
+    buffer = LastLoginBuffer(interval=60, max_pending=2)
+    db = MockDB()
+
+    async def scenario():
+        task = asyncio.create_task(buffer.run(db))
+        await asyncio.sleep(0)
+        buffer.record("alice")
+        buffer.record("bob")
+        for _ in range(10):
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert len(db.users.writes) == 1
+
+def test_cancelled_flush_is_written_by_the_final_flush():
+    buffer = LastLoginBuffer(interval=0, max_pending=100)
+    buffer.record("alice", datetime(2025, 1, 1))
+    blocked = MockDB()
+
+    async def never_returns(requests, ordered=True):
+        await asyncio.Event().wait()
+    blocked.users.bulk_write = never_returns
+
+    async def scenario():
+        task = asyncio.create_task(buffer.run(blocked))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # Shutdown cancels the flusher while its write is in flight
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        db = MockDB()
+        assert await buffer.flush(db) == 1
+        return db
+
+    db = asyncio.run(scenario())
+    assert db.users.writes == [[("alice", datetime(2025, 1, 1))]]
@@ -0,0 +1,56 @@
+import logging
+import queue
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging import (
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    RequestIdMiddleware,
+    SamplingFilter,
+    request_id_var,
+)
+
+
+def make_record(level=logging.INFO, lineno=1):
+    return logging.LogRecord("test", level, __file__, lineno, "value %s", ("x",), None)
+
+def test_sampling_filter_keeps_one_in_n_per_call_site():
+    sampler = SamplingFilter(0.25)
+    kept = [sampler.filter(make_record()) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert sampler.filter(make_record(lineno=2))
+    assert all(sampler.filter(make_record(logging.WARNING)) for _ in range(4))
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    log_queue = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    record = log_queue.get_nowait()
+    assert record.args == ("x",)
+    assert record.getMessage() == "value x"
+    assert handler.dropped == 1
+
+def test_request_id_is_bound_and_echoed():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    seen = {}
+
+    @app.get("/")
+    async def index():
+        record = make_record()
+        RequestIdFilter().filter(record)
+        seen["request_id"] = record.request_id
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    assert seen["request_id"] == "abc-123"
+
+    response = client.get("/", headers={"X-Request-ID": "bad id\nvalue"})
+    assert response.headers["x-request-id"] == seen["request_id"] != "bad id\nvalue"
+    assert request_id_var.get() is None
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Metrics, TimingMiddleware, metrics, mongo_command_listener, track
+from app.main import app as main_app
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with track("serialization"):
+            # Simulate a Mongo command completing during the request
+            mongo_command_listener.started(SimpleNamespace(
+                request_id=1, command_name="find", command={"find": "brand"}
+            ))
+            mongo_command_listener.succeeded(SimpleNamespace(
+                request_id=1, command_name="find", duration_micros=2000
+            ))
+        return {"id": item_id}
+
+    metrics.clear()
+    return TestClient(app)
+
+def test_requests_are_timed_per_route_template(client):
+    client.get("/items/1")
+    client.get("/items/2")
+
+    latency = metrics.histogram("http_request_duration_seconds", "", method="GET", route="/items/{item_id}")
+    assert latency.count == 2
+
+    mongo = metrics.histogram(
+        "http_request_phase_duration_seconds", "", method="GET", route="/items/{item_id}", phase="mongo"
+    )
+    assert mongo.count == 2
+    assert mongo.sum == pytest.approx(0.004)
+
+    commands = metrics.histogram("mongo_command_duration_seconds", "", collection="brand", command="find")
+    assert commands.count == 2
+
+def test_unmatched_paths_share_one_series(client):
+    client.get("/missing/1")
+    client.get("/missing/2")
+
+    latency = metrics.histogram("http_request_duration_seconds", "", method="GET", route="<unmatched>")
+    assert latency.count == 2
+    assert "/missing/1" not in metrics.render()
+
+def test_mongo_commands_are_monitored_only_with_metrics(monkeypatch):
+    from app.core import database
+
+    monkeypatch.setattr(database.settings, "metrics_enabled", False)
+    assert database.create_client().options.event_listeners == []
+
+    monkeypatch.setattr(database.settings, "metrics_enabled", True)
+    assert database.create_client().options.event_listeners == [mongo_command_listener]
+
+def test_phases_outside_requests_are_ignored():
+    with track("auth"):
+        pass
+
+def test_render_prometheus_text():
+    registry = Metrics()
+    registry.histogram("latency_seconds", "Latency", route="/a").observe(0.02)
+    registry.inc("requests_total", "Requests", route="/a", status="200")
+    text = registry.render({"cache_size": {(("cache", "user"),): 3}})
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.01"} 0' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.025"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 1' in text
+    assert 'requests_total{route="/a",status="200"} 1' in text
+    assert 'cache_size{cache="user"} 3' in text
+
+def test_metrics_endpoint_is_off_by_default():
+    assert TestClient(main_app).get("/metrics").status_code == 404
+
+def test_metrics_endpoint_requires_the_token(monkeypatch):
+    from app.routes import metrics as metrics_routes
+
+    monkeypatch.setattr(metrics_routes.settings, "metrics_token", "scrape-secret")
+    app = FastAPI()
+    app.include_router(metrics_routes.router)
+    client = TestClient(app)
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'cache_hits{cache="user"}' in response.text
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest  # type: ignore
+from fastapi.testclient import TestClient
+
+from app.core.database import get_database
+from app.core.exceptions import AuthenticationException
+from app.core.refresh_tokens import (
+    REFRESH_TOKENS_COLLECTION,
+    hash_refresh_token,
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from app.main import app
+
+
+@pytest.fixture
+def db():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    db = mongomock_motor.AsyncMongoMockClient()["refresh_test"]
+    asyncio.run(db.users.insert_one({"username": "alice"}))
+    return db
+
+def test_rotation_issues_a_new_token(db):
+    async def scenario():
+        token = await issue_refresh_token(db, "alice")
+        username, rotated = await rotate_refresh_token(db, token)
+        assert username == "alice"
+        assert rotated != token
+        assert await db[REFRESH_TOKENS_COLLECTION].count_documents({"token_hash": token}) == 0
+    asyncio.run(scenario())
+
+def test_rotation_keeps_the_session_expiry(db):
+    async def scenario():
+        collection = db[REFRESH_TOKENS_COLLECTION]
+        token = await issue_refresh_token(db, "alice")
+        first = await collection.find_one({"token_hash": hash_refresh_token(token)})
+        _, rotated = await rotate_refresh_token(db, token)
+        second = await collection.find_one({"token_hash": hash_refresh_token(rotated)})
+        assert second["expires_at"] == first["expires_at"]
+        assert second["family_id"] == first["family_id"]
+    asyncio.run(scenario())
+
+def test_deleted_user_cannot_refresh(db):
+    async def scenario():
+        token = await issue_refresh_token(db, "alice")
+        other_session = await issue_refresh_token(db, "alice")
+        await db.users.delete_one({"username": "alice"})
+        with pytest.raises(AuthenticationException):
+            await rotate_refresh_token(db, token)
+        with pytest.raises(AuthenticationException):
+            await rotate_refresh_token(db, other_session)
+    asyncio.run(scenario())
+
+def test_reused_token_revokes_the_session(db):
+    async def scenario():
+        token = await issue_refresh_token(db, "alice")
+        _, rotated = await rotate_refresh_token(db, token)
+        with pytest.raises(AuthenticationException):
+            await rotate_refresh_token(db, token)
+        # The legitimate successor is revoked along with the replayed token
+        with pytest.raises(AuthenticationException):
+            await rotate_refresh_token(db, rotated)
+    asyncio.run(scenario())
+
+def test_logout_revokes_the_session(db):
+    async def scenario():
+        token = await issue_refresh_token(db, "alice")
+        other_session = await issue_refresh_token(db, "alice")
+        await revoke_refresh_token(db, token)
+        with pytest.raises(AuthenticationException):
+            await rotate_refresh_token(db, token)
+        assert (await rotate_refresh_token(db, other_session))[0] == "alice"
+    asyncio.run(scenario())
+
+def test_refresh_endpoint(db):
+    async def override_db():
+        return db
+    app.dependency_overrides[get_database] = override_db
+    try:
+        client = TestClient(app)
+        token = asyncio.run(issue_refresh_token(db, "alice"))
+        response = client.post("/auth/refresh", json={"refresh_token": token})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["token_type"] == "bearer"
+        assert body["refresh_token"] != token
+
+        assert client.post("/auth/refresh", json={"refresh_token": "unknown"}).status_code == 401
+        assert client.post("/auth/logout", json={"refresh_token": body["refresh_token"]}).status_code == 204
+        assert client.post("/auth/refresh", json={"refresh_token": body["refresh_token"]}).status_code == 401
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest  # type: ignore
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.security import (
+    PasswordHashPool,
+    get_password_hash_async,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_on_pool():
+    hashed = await get_password_hash_async("Test123!@#")
+    assert await verify_password_async("Test123!@#", hashed)
+    assert not await verify_password_async("Wrong123!@#", hashed)
+
+@pytest.mark.asyncio
+async def test_weak_password_is_rejected_before_hashing():
+    with pytest.raises(ValueError):
+        await get_password_hash_async("weak")
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_is_full():
+    pool = PasswordHashPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+    busy = asyncio.ensure_future(pool.run(release.wait))
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceUnavailableException) as exc_info:
+        await pool.run(lambda: None)
+    assert exc_info.value.status_code == 503
+    release.set()
+    assert await busy is True
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    pool.shutdown()
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest  # type: ignore
+
+from scripts.seed_data import generate_batch, seed_collection
+
+
+def test_batches_are_deterministic_and_independent():
+    first = generate_batch("brand", seed=7, batch=3, batch_size=10, total=100)
+    assert first == generate_batch("brand", seed=7, batch=3, batch_size=10, total=100)
+    assert first != generate_batch("brand", seed=8, batch=3, batch_size=10, total=100)
+    assert first[0]["name"].endswith(" 30")
+    assert first[0]["name_lower"] == first[0]["name"].lower()
+
+def test_last_batch_stops_at_total():
+    assert len(generate_batch("tickets", seed=1, batch=2, batch_size=10, total=25)) == 5
+
+def test_seed_collection_inserts_every_document():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    db = mongomock_motor.AsyncMongoMockClient()["seed_test"]
+
+    asyncio.run(seed_collection(db, "merchant", total=23, seed=1, batch_size=5, concurrency=3))
+
+    assert asyncio.run(db.merchant.count_documents({})) == 23
+
+def test_drop_refuses_the_application_database():
+    from app.core.config import settings
+    from scripts.seed_data import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(["--drop"])
+    with pytest.raises(SystemExit):
+        parse_args(["--drop", "--database", settings.database_name])
+    assert parse_args(["--drop", "--force"]).drop
+    assert parse_args(["--drop", "--database", "seed_only"]).database == "seed_only"
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+from scripts.startup_report import LAZY_MODULES
+
+
+def test_app_import_does_not_load_export_dependencies():
+    probe = "import sys, app.main; print(','.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "test-secret")},
+    )
+    assert result.stdout.strip() == ""
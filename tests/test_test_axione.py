@@ -1,7 +1,10 @@
+import json
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
 import pytest  # type: ignore
+from fastapi import HTTPException
+from pymongo.errors import BulkWriteError
 
 from app.routes import test_axione
 from app.routes.test_axione import TicketCreate, TicketStatus, TicketUpdate
@@ -14,7 +17,19 @@ def mock_db():
             self.docs = []
         async def insert_one(self, doc):
             self.docs.append(doc)
-        def find(self, query):
+        async def insert_many(self, docs, ordered=True):
+            self.insert_many_calls = getattr(self, "insert_many_calls", 0) + 1
+            errors = []
+            for index, doc in enumerate(docs):
+                if doc["title"] == "duplicate":
+                    errors.append({"index": index, "errmsg": "E11000 duplicate key"})
+                    if ordered:
+                        break
+                else:
+                    self.docs.append(doc)
+            if errors:
+                raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+        def find(self, query, projection=None):
             class Cursor:
                 def __init__(self, docs):
                     self.docs = docs
@@ -29,12 +44,20 @@ def mock_db():
                 filtered = [d for d in filtered if query["title"]["$regex"].lower() in d["title"].lower()]  # noqa: E501
             if "status" in query:
                 filtered = [d for d in filtered if d["status"] == query["status"]]
+            if projection:
+                filtered = [{k: v for k, v in d.items() if projection.get(k)} for d in filtered]
             return Cursor(filtered)
         async def find_one(self, query):
             for doc in self.docs:
                 if doc["id"] == query["id"]:
                     return doc
             return None
+        async def find_one_and_update(self, query, update, return_document=None):
+            for doc in self.docs:
+                if doc["id"] == query["id"]:
+                    doc.update(update["$set"])
+                    return doc
+            return None
         async def update_one(self, query, update):
             for doc in self.docs:
                 if doc["id"] == query["id"]:
@@ -76,6 +99,27 @@ async def test_list_tickets(mock_db):
     assert len(tickets) == 1
     assert tickets[0].id == UUID(ticket_id)
 
+@pytest.mark.asyncio
+async def test_list_tickets_with_fields(mock_db):
+    ticket_id = str(uuid4())
+    mock_db["tickets"].docs.append({
+        "id": ticket_id,
+        "title": "Incident fibre",
+        "description": "Coupure",
+        "status": "open",
+        "created_at": datetime.now(timezone.utc)
+    })
+    response = await test_axione.list_tickets(
+        db=mock_db, title=None, status=None, limit=10, fields="title,status"
+    )
+    assert json.loads(response.body) == [{"id": ticket_id, "title": "Incident fibre", "status": "open"}]
+
+    with pytest.raises(HTTPException) as exc:
+        await test_axione.list_tickets(
+            db=mock_db, title=None, status=None, limit=10, fields="secret"
+        )
+    assert exc.value.status_code == 400
+
 @pytest.mark.asyncio
 async def test_list_tickets_with_filter(mock_db):
     mock_db["tickets"].docs.append({
@@ -144,3 +188,43 @@ async def test_close_ticket(mock_db):
     user = {}  # noqa: F841, RUF100 
     ticket = await test_axione.close_ticket(ticket_id=UUID(ticket_id), db=mock_db, user=user)  # noqa: E501
     assert ticket.status == TicketStatus.closed
+
+@pytest.mark.asyncio
+async def test_create_tickets_uses_one_insert_many_per_chunk(mock_db, monkeypatch):
+    monkeypatch.setattr(test_axione.settings, "ticket_bulk_chunk_size", 2)
+    tickets = [TicketCreate(title=f"Incident {i}", description="Desc") for i in range(5)]
+    result = await test_axione.create_tickets(tickets, db=mock_db, user={})
+    assert len(result) == 5
+    assert mock_db["tickets"].insert_many_calls == 3
+
+@pytest.mark.asyncio
+async def test_bulk_ordered_stops_at_first_failure(mock_db):
+    tickets = [TicketCreate(title=title, description="Desc") for title in ("a", "duplicate", "b", "c")]
+    report = await test_axione.create_tickets_bulk(
+        tickets, db=mock_db, user={}, ordered=True, chunk_size=2
+    )
+    assert [r.status for r in report.results] == ["created", "failed", "skipped", "skipped"]
+    assert report.results[1].error.startswith("E11000")
+    assert (report.created, report.failed, report.skipped) == (1, 1, 2)
+    assert len(mock_db["tickets"].docs) == 1
+
+@pytest.mark.asyncio
+async def test_bulk_unordered_inserts_every_valid_ticket(mock_db):
+    tickets = [TicketCreate(title=title, description="Desc") for title in ("a", "duplicate", "b", "c")]
+    report = await test_axione.create_tickets_bulk(
+        tickets, db=mock_db, user={}, ordered=False, chunk_size=3
+    )
+    assert [r.status for r in report.results] == ["created", "failed", "created", "created"]
+    assert report.results[3].index == 3
+    assert len(mock_db["tickets"].docs) == 3
+
+@pytest.mark.asyncio
+async def test_update_missing_ticket_returns_404(mock_db):
+    with pytest.raises(HTTPException) as exc_info:
+        await test_axione.update_ticket(
+            ticket_id=uuid4(), update=TicketUpdate(title="New"), db=mock_db, user={}
+        )
+    assert exc_info.value.status_code == 404
+    with pytest.raises(HTTPException) as exc_info:
+        await test_axione.close_ticket(ticket_id=uuid4(), db=mock_db, user={})
+    assert exc_info.value.status_code == 404
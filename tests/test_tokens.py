@@ -0,0 +1,65 @@
+import time
+
+import pytest  # type: ignore
+
+from app.core import cache as cache_module
+from app.core import tokens
+from app.core.cache import TTLCache
+from app.core.tokens import TokenError, TokenVerifier, get_jwt_backend
+
+
+class CountingBackend:
+    def __init__(self, backend):
+        self.backend = backend
+        self.decodes = 0
+    def encode(self, claims, key, algorithm):
+        return self.backend.encode(claims, key, algorithm)
+    def decode(self, token, key, algorithms):
+        self.decodes += 1
+        return self.backend.decode(token, key, algorithms)
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = time.time()
+        def __call__(self):
+            return self.now
+    fake = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    monkeypatch.setattr(tokens.time, "time", fake)
+    return fake
+
+def make_verifier(backend_name="jose"):
+    backend = CountingBackend(get_jwt_backend(backend_name))
+    return TokenVerifier(backend, "secret", "HS256", TTLCache(maxsize=16, ttl=300)), backend
+
+def test_signature_is_checked_once_per_token(clock):
+    verifier, backend = make_verifier()
+    token = verifier.encode({"sub": "alice"}, expires_in=600)
+    assert verifier.verify(token)["sub"] == "alice"
+    assert verifier.verify(token)["sub"] == "alice"
+    assert backend.decodes == 1
+
+def test_cached_claims_do_not_outlive_the_token(clock):
+    verifier, backend = make_verifier()
+    token = verifier.encode({"sub": "alice"}, expires_in=60)
+    verifier.verify(token)
+    clock.now += 61
+    verifier.verify(token)
+    assert backend.decodes == 2
+
+def test_invalid_tokens_raise_and_are_not_cached(clock):
+    verifier, backend = make_verifier()
+    with pytest.raises(TokenError):
+        verifier.verify("not-a-token")
+    with pytest.raises(TokenError):
+        verifier.verify("not-a-token")
+    assert backend.decodes == 2
+    assert len(verifier.cache) == 0
+
+def test_pyjwt_backend_reads_jose_tokens():
+    pytest.importorskip("jwt")
+    jose_verifier, _ = make_verifier("jose")
+    pyjwt_verifier, _ = make_verifier("pyjwt")
+    token = jose_verifier.encode({"sub": "alice"}, expires_in=600)
+    assert pyjwt_verifier.verify(token)["sub"] == "alice"